@@ -0,0 +1,5 @@
+"""
+Benchmarks of the JavaScript code structure detection.
+
+Run them from the repository root, for exemple: python -m benchmarks.bench_detector
+"""
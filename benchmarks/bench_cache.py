@@ -0,0 +1,68 @@
+"""
+Compare a cold and a warm Cache over generated files, and check that a change of the rules order invalidates it.
+
+Usage: python -m benchmarks.bench_cache [--files 2000]
+"""
+import argparse
+import tempfile
+import time
+
+from jsCodeStructureDetection import Detector
+from jsCodeStructureCache import Cache
+from benchmarks.rules import blocks, singles
+from benchmarks.corpus import GetSampleLines, GetClasses
+
+def GetFiles(nb_files):
+    """
+    Generate distinct files: README samples and small generated classes, each with its own last line.
+
+    Args:
+        nb_files (int): The number of files.
+
+    Returns:
+        list of list of str: The lines of each file.
+    """
+    contents = [GetSampleLines(), GetClasses(300, 10)]
+    return [contents[i % len(contents)] + [f'// file {i}\n'] for i in range(nb_files)]
+
+def Run(cache, files):
+    """
+    Get the elements of all the files through a cache.
+
+    Args:
+        cache (Cache): The cache.
+        files (list of list of str): The lines of each file.
+
+    Returns:
+        tuple: The elements of each file and the duration in seconds.
+    """
+    start = time.perf_counter()
+    results = [cache.GetElements(lines) for lines in files]
+    return results, time.perf_counter() - start
+
+def Main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--files', type=int, default=2000, help='number of files generated')
+    args = parser.parse_args()
+
+    files = GetFiles(args.files)
+    detector = Detector(blocks, singles)
+    start = time.perf_counter()
+    expected = [detector.GetElements(lines) for lines in files]
+    print(f'   no cache : {args.files / (time.perf_counter() - start):9.1f} files/s')
+
+    with tempfile.TemporaryDirectory() as directory:
+        for run in ('cold', 'warm'):
+            cache = Cache(directory, blocks, singles)
+            results, duration = Run(cache, files)
+            assert results == expected, f'Different results with a {run} cache'
+            print(f'{run:>11} : {args.files / duration:9.1f} files/s  ({cache.hits} hits, {cache.misses} misses, {cache.size / 1024:.0f} KB)')
+
+        reordered = dict(reversed(list(blocks.items())))
+        cache = Cache(directory, reordered, singles)
+        Run(cache, files)
+        assert cache.hits == 0, 'The cache is not invalidated by a change of the rules order'
+        print(f'  reordered : {cache.hits} hits, {cache.misses} misses')
+
+if __name__ == '__main__':
+    Main()
@@ -0,0 +1,44 @@
+"""
+Compare the vectorized blocks depth (BracketDepth) with the line rescan (LineDepth) on deeply nested code.
+
+The outputs of both are checked to be the same, on the README sample and on the generated corpus.
+
+Usage: python -m benchmarks.bench_depth [--depth 200] [--repeat 20]
+"""
+import argparse
+import time
+
+from jsCodeStructureDetection import Detector
+from benchmarks.rules import blocks, singles
+from benchmarks.corpus import GetSampleLines, GetDeepNesting
+
+def Main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--depth', type=int, default=200, help='number of nested functions')
+    parser.add_argument('--repeat', type=int, default=20, help='number of times the nested functions are repeated')
+    args = parser.parse_args()
+
+    vectorized = Detector(blocks, singles)
+    rescan = Detector(blocks, singles, vectorized=False)
+
+    sample = GetSampleLines()
+    assert vectorized.GetElements(sample) == rescan.GetElements(sample), 'Different output on the README sample'
+
+    lines = GetDeepNesting(args.depth, args.repeat)
+    start = time.perf_counter()
+    expected = rescan.GetElements(lines)
+    rescan_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = vectorized.GetElements(lines)
+    vectorized_time = time.perf_counter() - start
+
+    assert result == expected, 'Different output on the deep nesting corpus'
+
+    print(f'Lines              : {len(lines)} (depth {args.depth})')
+    print(f'LineDepth          : {rescan_time:9.3f} s')
+    print(f'BracketDepth       : {vectorized_time:9.3f} s')
+    print(f'Gain               : {rescan_time / vectorized_time:9.2f}x')
+
+if __name__ == '__main__':
+    Main()
@@ -0,0 +1,50 @@
+"""
+Compare the per-file cost of GetElements (rules compiled at each call) with a reused Detector.
+
+Usage: python -m benchmarks.bench_detector [--files 2000] [--repeat 3]
+"""
+import argparse
+import time
+
+from jsCodeStructureDetection import GetElements, Detector
+from benchmarks.rules import blocks, singles
+from benchmarks.corpus import GetSampleLines
+
+def Measure(function, files, repeat):
+    """
+    Time a function over a list of files and keep the best run.
+
+    Args:
+        function (callable): The function called with the lines of each file.
+        files (list of list of str): The files to process.
+        repeat (int): The number of runs.
+
+    Returns:
+        float: The best time in seconds.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for lines in files:
+            function(lines)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def Main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--files', type=int, default=2000, help='number of files processed')
+    parser.add_argument('--repeat', type=int, default=3, help='number of runs, the best one is kept')
+    args = parser.parse_args()
+
+    files = [GetSampleLines() for _ in range(args.files)]
+    detector = Detector(blocks, singles)
+
+    per_call = Measure(lambda lines: GetElements(lines, blocks, singles), files, args.repeat)
+    reused = Measure(detector.GetElements, files, args.repeat)
+
+    print(f'GetElements        : {per_call / args.files * 1e6:9.1f} us/file')
+    print(f'Detector (reused)  : {reused / args.files * 1e6:9.1f} us/file')
+    print(f'Gain               : {per_call / reused:9.2f}x')
+
+if __name__ == '__main__':
+    Main()
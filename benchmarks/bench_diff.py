@@ -0,0 +1,127 @@
+"""
+Diffs/sec of the structural diff over a history of edits of a typical file, against a full GetElements of both versions.
+
+Each version of the history is made from the previous one by an edit of a kind. The History processes each version
+only where it changed, DiffElements processes the old version entirely, the full way gets the elements of both
+versions and hashes all their lines. Each diff is checked against the full way.
+
+Usage: python -m benchmarks.bench_diff [--lines 500] [--versions 500]
+"""
+import argparse
+import random
+import time
+
+from jsCodeStructureDetection import Detector
+from jsCodeStructureDiff import DiffElements, History, GetLineHash, Match
+from benchmarks.rules import blocks, singles
+from benchmarks.corpus import GetClasses
+
+METHOD_LINES = 10   # The lines of a documented method of GetClasses, the empty one after it included
+
+def MoveMethod(lines, rand):
+    """
+    Move a documented method before another one.
+
+    Args:
+        lines (list of str): The lines of the file.
+        rand (random.Random): The random generator.
+
+    Returns:
+        list of str: The edited lines.
+    """
+    starts = [i for i, line in enumerate(lines) if line == '    /*\n' and i + METHOD_LINES <= len(lines)]
+    source, target = rand.sample(starts, 2)
+    method = lines[source:source+METHOD_LINES]
+    lines = lines[:source] + lines[source+METHOD_LINES:]
+    target = target if target < source else target - METHOD_LINES
+    return lines[:target] + method + lines[target:]
+
+# Name: edit of the lines at a random line
+EDITS = {
+    'keystroke': lambda lines, i, rand: lines[:i] + [lines[i].rstrip('\n') + ' // x\n'] + lines[i+1:],
+    'insert': lambda lines, i, rand: lines[:i] + ['        console.log(value);\n'] + lines[i:],
+    'delete': lambda lines, i, rand: lines[:i] + lines[i+1:],
+    'move': lambda lines, i, rand: MoveMethod(lines, rand),
+}
+
+def GetVersions(lines, kind, versions, seed=0):
+    """
+    Make a history of a file, each version being an edit of a kind of the previous one.
+
+    Args:
+        lines (list of str): The first version.
+        kind (str): The kind of edit (a key of EDITS).
+        versions (int): The number of versions after the first one.
+        seed (int, optional): The random seed. Defaults to 0.
+
+    Returns:
+        list of list of str: The versions, the first one included.
+    """
+    rand = random.Random(seed)
+    history = [lines]
+    for _ in range(versions):
+        history.append(EDITS[kind](history[-1], rand.randrange(len(history[-1])), rand))
+    return history
+
+def FullDiff(detector, old_lines, new_lines):
+    """
+    Get the structural diff from the elements of both versions, all their lines being processed and hashed.
+
+    Args:
+        detector (Detector): The compiled rules.
+        old_lines (list of str): The lines of the old version.
+        new_lines (list of str): The lines of the new version.
+
+    Returns:
+        Diff: The changed elements.
+    """
+    def GetKeys(lines):
+        line_hashes = [GetLineHash(line) for line in lines]
+        elements = detector.GetElements(lines)
+        return elements, [(type_, name, hash(tuple(line_hashes[start:end+1]))) for type_, start, end, name in elements]
+    return Match(*GetKeys(old_lines), *GetKeys(new_lines))
+
+def Measure(name, diff, history):
+    """
+    Time the diffs between the successive versions of a history.
+
+    Args:
+        name (str): The name of the way.
+        diff (function): The diff of two successive versions.
+        history (list of list of str): The versions.
+
+    Returns:
+        list of Diff: The diffs.
+    """
+    start = time.perf_counter()
+    diffs = [diff(old_lines, new_lines) for old_lines, new_lines in zip(history, history[1:])]
+    elapsed = time.perf_counter() - start
+    print(f'    {name:<13} : {elapsed / len(diffs) * 1000:8.3f} ms/diff ({len(diffs) / elapsed:7.0f} diffs/s)')
+    return diffs
+
+def Main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--lines', type=int, default=500, help='number of lines of the file')
+    parser.add_argument('--versions', type=int, default=500, help='number of edits of each kind')
+    args = parser.parse_args()
+
+    detector = Detector(blocks, singles)
+    lines = GetClasses(args.lines, 10)
+
+    for kind in EDITS:
+        history = GetVersions(lines, kind, args.versions)
+        print(f'{kind} ({args.lines} lines, {args.versions} versions)')
+
+        walk = History(detector, history[0])
+        diffs = {
+            'History': Measure('History', lambda old_lines, new_lines: walk.Diff(new_lines), history),
+            'DiffElements': Measure('DiffElements', lambda old_lines, new_lines: DiffElements(old_lines, new_lines, detector), history),
+            'full': Measure('full', lambda old_lines, new_lines: FullDiff(detector, old_lines, new_lines), history),
+        }
+        for name in ('History', 'DiffElements'):
+            for v, (diff, full) in enumerate(zip(diffs[name], diffs['full'])):
+                if (diff.added, diff.removed, diff.moved, diff.modified) != (full.added, full.removed, full.moved, full.modified):
+                    raise Exception(f'{name}: the {kind} version {v+1} don\'t give the same diff as the full way.')
+
+if __name__ == '__main__':
+    Main()
@@ -0,0 +1,92 @@
+"""
+Compare the list of lists elements with the compact Elements: memory, pickle, JSON and binary file save/load.
+
+Usage: python -m benchmarks.bench_elements [--lines 500000]
+"""
+import argparse
+import json
+import os
+import pickle
+import random
+import tempfile
+import time
+import tracemalloc
+
+from jsCodeStructureDetection import Detector
+from jsCodeStructureElements import Elements
+from benchmarks.rules import blocks, singles
+from benchmarks.corpus import GetClasses
+
+def GetRetained(function):
+    """
+    Call a function and measure the memory kept by its result.
+
+    Args:
+        function (callable): The function, called without arguments.
+
+    Returns:
+        tuple: The result and the memory allocated and not freed by the call, in MB.
+    """
+    tracemalloc.start()
+    result = function()
+    retained = tracemalloc.get_traced_memory()[0] / 2**20
+    tracemalloc.stop()
+    return result, retained
+
+def Time(function):
+    """
+    Time a call.
+
+    Args:
+        function (callable): The function, called without arguments.
+
+    Returns:
+        tuple: The result and the duration in ms.
+    """
+    start = time.perf_counter()
+    result = function()
+    return result, (time.perf_counter() - start) * 1000
+
+def Main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--lines', type=int, default=500000, help='number of lines of the generated file')
+    args = parser.parse_args()
+
+    detector = Detector(blocks, singles)
+    lines = GetClasses(args.lines, 100)
+
+    elements, list_memory = GetRetained(lambda: detector.GetElements(lines))
+    compact, compact_memory = GetRetained(lambda: detector.GetElements(lines, compact=True))
+    assert compact == elements, 'Different elements in the compact form'
+
+    print(f'Elements           : {len(elements)} ({args.lines} lines)')
+    print(f'Memory             : {list_memory:9.1f} MB list  {compact_memory:9.1f} MB compact')
+
+    for name, value in (('list', elements), ('compact', compact)):
+        data, dump_time = Time(lambda: pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        _, load_time = Time(lambda: pickle.loads(data))
+        print(f'Pickle {name:<11} : {len(data) / 2**20:9.1f} MB  dump {dump_time:9.1f} ms  load {load_time:9.1f} ms')
+
+    data, dump_time = Time(lambda: json.dumps(elements))
+    _, load_time = Time(lambda: json.loads(data))
+    print(f'JSON list          : {len(data) / 2**20:9.1f} MB  dump {dump_time:9.1f} ms  load {load_time:9.1f} ms')
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'elements.bin')
+        _, save_time = Time(lambda: compact.Save(path))
+        size = os.path.getsize(path) / 2**20
+        print(f'File compact       : {size:9.1f} MB  save {save_time:9.1f} ms')
+
+        loaded, read_time = Time(lambda: Elements.Load(path, mapped=False))
+        assert loaded == elements, 'Different elements after a load'
+        mapped, map_time = Time(lambda: Elements.Load(path))
+        print(f'Load               : {read_time:9.3f} ms read  {map_time:9.3f} ms mapped')
+
+        rand = random.Random(0)
+        queries = [rand.randrange(args.lines) for _ in range(1000)]
+        _, query_time = Time(lambda: [mapped.GetRange(line, line + 100).ToList() for line in queries])
+        print(f'Mapped queries     : {query_time / len(queries) * 1000:9.1f} us per 100 lines range')
+        del loaded, mapped
+
+if __name__ == '__main__':
+    Main()
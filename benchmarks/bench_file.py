@@ -0,0 +1,130 @@
+"""
+Compare GetElementsFromPath (mapped file, normalized by chunks of bytes) with GetElements on the readlines of the file.
+
+Each way runs in its own process so its peak RSS is its own. The input time is the one to get the normalized lines
+(reading, decoding and normalizing them), the total time is the one of the elements.
+
+Usage: python -m benchmarks.bench_file [--lines 1000000]
+"""
+import argparse
+import json
+import mmap
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from jsCodeStructureDetection import Detector, GetNormalizedLine
+from jsCodeStructureFile import GetElementsFromPath, IterChunks
+from benchmarks.rules import blocks, singles
+from benchmarks.corpus import GetFunctionBodies, GetClasses
+
+# Name: generator of a number of lines
+CORPORA = {
+    'function_bodies': lambda n: GetFunctionBodies(n, 20),
+    'classes': lambda n: GetClasses(n, 100),
+}
+
+def GetPeakRss():
+    """
+    Get the peak resident memory of the current process.
+
+    Returns:
+        float: The peak RSS in MB.
+    """
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**10
+
+def Run(way, path):
+    """
+    Get the elements of a file in one way, in the current process.
+
+    Args:
+        way (str): 'readlines' or 'path'.
+        path (str): The file path.
+
+    Returns:
+        dict: The input time, the total time (in s), the peak RSS before and after (in MB) and the number of elements.
+    """
+    detector = Detector(blocks, singles)
+    start_rss = GetPeakRss()
+
+    if way == 'readlines':
+        start = time.perf_counter()
+        with open(path, encoding='utf-8') as file:
+            lines = file.readlines()
+        read_time = time.perf_counter() - start
+        lines_content = [GetNormalizedLine(line) for line in lines]
+        input_time = time.perf_counter() - start
+        del lines_content
+
+        start = time.perf_counter()
+        elements = detector.GetElements(lines)
+        total_time = read_time + time.perf_counter() - start
+    else:
+        start = time.perf_counter()
+        with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for _ in IterChunks(data, 'utf-8'):
+                pass
+        input_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        elements = GetElementsFromPath(path, detector)
+        total_time = time.perf_counter() - start
+
+    return {'input': input_time, 'total': total_time, 'start_rss': start_rss, 'peak_rss': GetPeakRss(), 'elements': len(elements)}
+
+def Write(corpus, path, nb_lines):
+    """
+    Write a generated file.
+
+    Args:
+        corpus (str): The generator, in CORPORA.
+        path (str): The file path.
+        nb_lines (int): The number of lines.
+    """
+    with open(path, 'w', encoding='utf-8') as file:
+        file.writelines(CORPORA[corpus](nb_lines))
+
+def RunChild(*args):
+    """
+    Run this benchmark in a new process, so its peak RSS don't start from the one of the current process.
+
+    Args:
+        *args (str): The arguments of the child.
+
+    Returns:
+        str: Its output.
+    """
+    return subprocess.run([sys.executable, '-m', 'benchmarks.bench_file', *args], capture_output=True, text=True, check=True).stdout
+
+def Main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--lines', type=int, default=1000000, help='number of lines of each generated file')
+    parser.add_argument('--run', nargs=2, metavar=('WAY', 'PATH'), help=argparse.SUPPRESS)        # Child process of one way
+    parser.add_argument('--write', nargs=2, metavar=('CORPUS', 'PATH'), help=argparse.SUPPRESS)    # Child process writing a file
+    args = parser.parse_args()
+
+    if args.run:
+        print(json.dumps(Run(*args.run)))
+        return
+    if args.write:
+        Write(*args.write, args.lines)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        for corpus in CORPORA:
+            path = os.path.join(directory, 'generated.js')
+            RunChild('--write', corpus, path, '--lines', str(args.lines))
+            print(f'{corpus} ({args.lines} lines, {os.path.getsize(path) / 2**20:.1f} MB)')
+
+            results = {}
+            for way in ('readlines', 'path'):
+                results[way] = result = json.loads(RunChild('--run', way, path))
+                print(f'    {way:<10} : input {result["input"]:7.2f} s  total {result["total"]:7.2f} s  '
+                      f'peak RSS {result["peak_rss"]:7.1f} MB ({result["peak_rss"] - result["start_rss"]:7.1f} MB over the imports)')
+            assert results['readlines']['elements'] == results['path']['elements'], f'{corpus}: different number of elements'
+
+if __name__ == '__main__':
+    Main()
@@ -0,0 +1,83 @@
+"""
+Latency of Analysis.Update for single-line edits in a big file (50k lines by default), against a full GetElements.
+
+Each edit is checked against a full parse of the edited lines. The deletes of a brace or a comment delimiter change
+the parser state until the end of the file, so these ones are processed again until there (the max), and the file
+gets more broken at each of them. With --top, the edits are in the first 1% of the lines, the rest of the file being
+shifted after each of them.
+
+Usage: python -m benchmarks.bench_incremental [--lines 50000] [--edits 200] [--checkpoint 32] [--top]
+"""
+import argparse
+import random
+import statistics
+import time
+
+from jsCodeStructureDetection import Detector
+from jsCodeStructureIncremental import Analysis
+from benchmarks.rules import blocks, singles
+from benchmarks.corpus import GetClasses
+
+EDITS = {
+    'keystroke': lambda lines, i: (i, i+1, [lines[i].rstrip('\n') + 'x\n']),   # A character typed at the end of a line
+    'insert': lambda lines, i: (i, i, ['        console.log(value);\n']),     # One added line
+    'delete': lambda lines, i: (i, i+1, []),                                   # One removed line
+}
+
+def Measure(detector, lines, kind, edits, checkpoint, top=False, seed=0):
+    """
+    Apply random edits of a kind and time each update.
+
+    Args:
+        detector (Detector): The compiled rules.
+        lines (list of str): The lines of the file.
+        kind (str): The kind of edit (a key of EDITS).
+        edits (int): The number of edits.
+        checkpoint (int): The number of lines between two checkpoints.
+        top (bool, optional): Edit only the first 1% of the lines. Defaults to False.
+        seed (int, optional): The random seed. Defaults to 0.
+
+    Returns:
+        list of float: The time of each update in ms.
+
+    Raises:
+        Exception: If an update don't give the same elements as a full parse.
+    """
+    rand = random.Random(seed)
+    lines = list(lines)
+    analysis = Analysis(detector, lines, checkpoint)
+    times = []
+    for e in range(edits):
+        start, end, new_lines = EDITS[kind](lines, rand.randrange(len(lines) // 100 if top else len(lines)))
+        lines[start:end] = new_lines
+
+        t = time.perf_counter()
+        analysis.Update(start, end, new_lines)
+        times.append((time.perf_counter() - t) * 1000)
+
+        if e % 20 == 0 and analysis.elements != detector.GetElements(lines):
+            raise Exception(f'The {kind} edit {e} on [{start}, {end}) don\'t give the same elements as a full parse.')
+    return times
+
+def Main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--lines', type=int, default=50000, help='number of lines of the file')
+    parser.add_argument('--edits', type=int, default=200, help='number of edits of each kind')
+    parser.add_argument('--checkpoint', type=int, default=32, help='number of lines between two checkpoints')
+    parser.add_argument('--top', action='store_true', help='edit only the first 1%% of the lines')
+    args = parser.parse_args()
+
+    detector = Detector(blocks, singles)
+    lines = GetClasses(args.lines, 100)
+
+    start = time.perf_counter()
+    detector.GetElements(lines)
+    print(f'Full GetElements : {(time.perf_counter() - start) * 1000:9.3f} ms')
+
+    for kind in EDITS:
+        times = Measure(detector, lines, kind, args.edits, args.checkpoint, args.top)
+        p90 = statistics.quantiles(times, n=10)[-1]
+        print(f'{kind:>16} : {statistics.median(times):9.3f} ms median  {p90:9.3f} ms p90  {max(times):9.3f} ms max')
+
+if __name__ == '__main__':
+    Main()
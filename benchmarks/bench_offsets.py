@@ -0,0 +1,63 @@
+"""
+Compare GetOffsetElements on minified code with the same code formatted, and check it runs in linear time.
+
+The minified code is the generated classes with their lines stripped and joined in a single line.
+
+Usage: python -m benchmarks.bench_offsets [--sizes 40000 400000]
+"""
+import argparse
+import time
+
+from jsCodeStructureDetection import Detector
+from jsCodeStructureOffsets import GetOffsetElements
+from benchmarks.rules import blocks, singles
+from benchmarks.corpus import GetClasses
+from benchmarks.bench_scaling import GetExponent
+
+def Minify(lines):
+    """
+    Join stripped lines in a single line, with a space only between two words.
+
+    Args:
+        lines (list of str): The formatted lines.
+
+    Returns:
+        str: The minified code.
+    """
+    stripped = [line.strip() for line in lines]
+    return ''.join(line + (' ' if line and line[-1].isalnum() else '') for line in stripped)
+
+def Main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[40000, 400000], help='number of formatted lines of each run')
+    args = parser.parse_args()
+
+    detector = Detector(blocks, singles)
+    times = []
+    for size in args.sizes:
+        lines = GetClasses(size, 100)
+        formatted, minified = ''.join(lines), Minify(lines)
+
+        start = time.perf_counter()
+        detector.GetElements(lines)
+        lines_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        GetOffsetElements(formatted, detector)
+        formatted_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        elements = GetOffsetElements(minified, detector)
+        minified_time = time.perf_counter() - start
+        times.append(minified_time)
+
+        print(f'{size} lines, {len(formatted) / 2**20:.1f} MB formatted, {len(minified) / 2**20:.1f} MB minified ({len(elements)} elements)')
+        print(f'    GetElements formatted       : {lines_time:9.3f} s  {len(formatted) / 2**20 / lines_time:6.2f} MB/s')
+        print(f'    GetOffsetElements formatted : {formatted_time:9.3f} s  {len(formatted) / 2**20 / formatted_time:6.2f} MB/s')
+        print(f'    GetOffsetElements minified  : {minified_time:9.3f} s  {len(minified) / 2**20 / minified_time:6.2f} MB/s')
+
+    if len(args.sizes) > 1:
+        print(f'Scaling exponent (minified) : {GetExponent(args.sizes, times):.2f}')
+
+if __name__ == '__main__':
+    Main()
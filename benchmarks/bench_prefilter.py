@@ -0,0 +1,53 @@
+"""
+Compare the block patterns searched only on the lines containing their keyword with all of them searched on every line.
+
+Usage: python -m benchmarks.bench_prefilter [--lines 200000] [--repeat 3]
+"""
+import argparse
+import time
+
+from jsCodeStructureDetection import Detector
+from jsCodeStructureProfile import ProfiledDetector
+from benchmarks.rules import blocks, singles
+from benchmarks.corpus import GetFunctionBodies, GetClasses
+
+def WithoutKeywords(detector):
+    """
+    Disable the keywords of a detector, so each block pattern is searched on every line as before.
+
+    Args:
+        detector (Detector): The detector, modified in place.
+
+    Returns:
+        Detector: The detector.
+    """
+    detector.block_rules = [(type_, regex, '', is_not_in, is_inside) for type_, regex, _, is_not_in, is_inside in detector.block_rules]
+    return detector
+
+def Main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--lines', type=int, default=200000, help='number of lines of each corpus')
+    parser.add_argument('--repeat', type=int, default=3, help='number of timed runs, the best one is kept')
+    args = parser.parse_args()
+
+    for corpus, lines in (('function bodies', GetFunctionBodies(args.lines, 20)), ('classes', GetClasses(args.lines, 100))):
+        print(f'{corpus} ({args.lines} lines)')
+        expected = None
+        for name, detector in (('all patterns', WithoutKeywords(Detector(blocks, singles))), ('keywords', Detector(blocks, singles))):
+            best = float('inf')
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                elements = detector.GetElements(lines)
+                best = min(best, time.perf_counter() - start)
+            expected = expected or elements
+            assert elements == expected, f'{corpus}: different elements with the {name}'
+
+            profiled = ProfiledDetector(blocks, singles)
+            if name == 'all patterns':
+                WithoutKeywords(profiled)
+            profiled.GetElements(lines)
+            searches = sum(profiled.stats.attempts[type_] for type_ in profiled.blocks_key)
+            print(f'    {name:<14} : {args.lines / best:9.0f} lines/s  {searches / args.lines:5.2f} pattern searches/line')
+
+if __name__ == '__main__':
+    Main()
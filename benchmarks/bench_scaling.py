@@ -0,0 +1,62 @@
+"""
+Check that GetElements runs in linear time on generated class/method code and nested functions, from 1k to 1M lines.
+
+The scaling exponent is the slope of log(time) against log(lines): 1 is linear, 2 is quadratic. The nested
+functions end up inside an open function, so the blocks that are followed must not grow with the input.
+
+Usage: python -m benchmarks.bench_scaling [--sizes 1000 10000 100000 1000000] [--methods 1000] [--depth 100] [--corpora classes nested_functions]
+"""
+import argparse
+import math
+import time
+
+from jsCodeStructureDetection import Detector
+from benchmarks.rules import blocks, singles
+from benchmarks.corpus import GetClasses, GetDeepNesting
+
+# Name: generator of a number of lines, from the arguments
+CORPORA = {
+    'classes': lambda n, args: GetClasses(n, args.methods),
+    'nested_functions': lambda n, args: GetDeepNesting(args.depth, n // (4*args.depth + 1) + 1, string_brace=False)[:n],
+}
+
+def GetExponent(sizes, times):
+    """
+    Fit the scaling exponent with a least squares on the log-log values.
+
+    Args:
+        sizes (list of int): The number of lines of each run.
+        times (list of float): The time of each run.
+
+    Returns:
+        float: The slope of log(time) against log(size).
+    """
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(t) for t in times]
+    x_mean, y_mean = sum(xs)/len(xs), sum(ys)/len(ys)
+    return sum((x-x_mean)*(y-y_mean) for x, y in zip(xs, ys)) / sum((x-x_mean)**2 for x in xs)
+
+def Main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000, 1000000], help='number of lines of each run')
+    parser.add_argument('--methods', type=int, default=1000, help='number of methods in each class')
+    parser.add_argument('--depth', type=int, default=100, help='number of nested functions')
+    parser.add_argument('--corpora', nargs='+', choices=list(CORPORA), default=list(CORPORA), help='generated corpora')
+    args = parser.parse_args()
+
+    detector = Detector(blocks, singles)
+    for corpus in args.corpora:
+        print(corpus)
+        times = []
+        for size in args.sizes:
+            lines = CORPORA[corpus](size, args)
+            start = time.perf_counter()
+            detector.GetElements(lines)
+            times.append(time.perf_counter() - start)
+            print(f'{size:>9} lines : {times[-1]:9.3f} s  {size / times[-1]:12.0f} lines/s')
+
+        if len(args.sizes) > 1:
+            print(f'Scaling exponent : {GetExponent(args.sizes, times):.2f}')
+
+if __name__ == '__main__':
+    Main()
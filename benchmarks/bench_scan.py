@@ -0,0 +1,52 @@
+"""
+Measure the throughput of ScanPaths (files/sec) with 1, 2, 4 and 8 workers on a generated repository.
+
+Usage: python -m benchmarks.bench_scan [--files 2000] [--workers 1 2 4 8]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from jsCodeStructureScan import ScanPaths
+from benchmarks.rules import blocks, singles
+from benchmarks.corpus import GetSampleLines, GetClasses
+
+def WriteRepository(directory, nb_files):
+    """
+    Write a generated repository: README samples and small generated classes, in nested folders.
+
+    Args:
+        directory (str): The root folder.
+        nb_files (int): The number of files.
+    """
+    contents = [''.join(GetSampleLines()), ''.join(GetClasses(300, 10))]
+    for i in range(nb_files):
+        folder = os.path.join(directory, f'package{i % 20}', f'module{i % 7}')
+        os.makedirs(folder, exist_ok=True)
+        with open(os.path.join(folder, f'file{i}.js'), 'w', encoding='utf-8') as file:
+            file.write(contents[i % len(contents)])
+
+def Main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--files', type=int, default=2000, help='number of files generated')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8], help='number of workers of each run')
+    args = parser.parse_args()
+
+    print(f'CPUs: {os.cpu_count()}')
+    with tempfile.TemporaryDirectory() as directory:
+        WriteRepository(directory, args.files)
+
+        expected = None
+        for workers in args.workers:
+            start = time.perf_counter()
+            results = dict(ScanPaths(directory, blocks, singles, workers=workers))
+            duration = time.perf_counter() - start
+
+            errors = sum(isinstance(elements, Exception) for elements in results.values())
+            assert expected is None or results == expected, f'Different results with {workers} workers'
+            expected = results
+            print(f'{workers:>2} workers : {len(results) / duration:9.1f} files/s  ({errors} errors)')
+
+if __name__ == '__main__':
+    Main()
@@ -0,0 +1,104 @@
+"""
+Compare the latency of a small file through the daemon client with a cold start of Python with the detection.
+
+Usage: python -m benchmarks.bench_server [--runs 20] [--files 1000] [--workers 1]
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from jsCodeStructureDetection import Detector
+from jsCodeStructureClient import RequestElements
+from benchmarks.rules import blocks, singles
+from benchmarks.corpus import SAMPLE_PATH
+
+# A new process per file, as a hook that runs the detection itself
+COLD_START = f'''
+from jsCodeStructureFile import GetElementsFromPath
+from jsCodeStructureDetection import Detector
+from benchmarks.rules import blocks, singles
+GetElementsFromPath({SAMPLE_PATH!r}, Detector(blocks, singles))
+'''
+
+def TimeProcess(command, runs):
+    """
+    Time a command run in a new process, several times.
+
+    Args:
+        command (list of str): The command.
+        runs (int): The number of runs.
+
+    Returns:
+        float: The median time in ms.
+    """
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+def WaitServer(socket_path, timeout=30):
+    """
+    Wait until the daemon accepts connections.
+
+    Args:
+        socket_path (str): The socket of the daemon.
+        timeout (float, optional): The maximum wait in seconds. Defaults to 30.
+    """
+    end = time.perf_counter() + timeout
+    while time.perf_counter() < end:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            try:
+                client.connect(socket_path)
+                return
+            except OSError:
+                time.sleep(0.05)
+    raise Exception(f'The daemon didn\'t start on {socket_path}.')
+
+def Main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=20, help='number of processes started for each way, the median is kept')
+    parser.add_argument('--files', type=int, default=1000, help='number of files sent to the daemon at once')
+    parser.add_argument('--workers', type=int, default=1, help='number of processes of the daemon')
+    args = parser.parse_args()
+
+    expected = Detector(blocks, singles).GetElements(open(SAMPLE_PATH, encoding='utf-8').readlines())
+
+    print(f'Python start        : {TimeProcess([sys.executable, "-c", "pass"], args.runs):9.1f} ms')
+    print(f'Cold start          : {TimeProcess([sys.executable, "-c", COLD_START], args.runs):9.1f} ms/file')
+
+    with tempfile.TemporaryDirectory() as directory:
+        socket_path = os.path.join(directory, 'daemon.sock')
+        daemon = subprocess.Popen([sys.executable, 'jsCodeStructureServer.py', '--socket', socket_path, '--workers', str(args.workers)], stdout=subprocess.DEVNULL)
+        try:
+            WaitServer(socket_path)
+            request = {'path': SAMPLE_PATH}
+            assert RequestElements([request], socket_path)[0]['elements'] == expected, 'Different elements through the daemon'
+
+            client = TimeProcess([sys.executable, 'jsCodeStructureClient.py', '--socket', socket_path, SAMPLE_PATH], args.runs)
+            print(f'Client              : {client:9.1f} ms/file')
+
+            times = []
+            for _ in range(args.runs * 10):
+                start = time.perf_counter()
+                RequestElements([request], socket_path)
+                times.append((time.perf_counter() - start) * 1000)
+            print(f'Round trip          : {statistics.median(times):9.2f} ms/file')
+
+            start = time.perf_counter()
+            responses = RequestElements([request] * args.files, socket_path)
+            batched = time.perf_counter() - start
+            assert all(response['elements'] == expected for response in responses), 'Different elements in a batch'
+            print(f'Batch of {args.files:<10} : {batched / args.files * 1000:9.2f} ms/file ({args.files / batched:7.0f} files/s)')
+        finally:
+            daemon.terminate()  # Stopped as by SIGTERM, which removes its socket
+            daemon.wait(timeout=30)
+
+if __name__ == '__main__':
+    Main()
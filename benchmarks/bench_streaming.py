@@ -0,0 +1,68 @@
+"""
+Check that IterElements keeps a flat memory over a long input (10M lines by default).
+
+The lines (classes, or nested functions) are generated on the fly, and the peak RSS is printed at regular intervals:
+it must stay flat, the parser state being bounded by the nesting depth.
+
+Usage: python -m benchmarks.bench_streaming [--lines 10000000] [--report 1000000] [--corpus classes]
+"""
+import argparse
+import resource
+import time
+
+from jsCodeStructureDetection import Detector
+from benchmarks.rules import blocks, singles
+from benchmarks.corpus import GetClasses, GetDeepNesting
+
+# Name: lines repeated to generate the input
+PATTERNS = {
+    'classes': lambda: GetClasses(100*10 + 2, 100),
+    'nested_functions': lambda: GetDeepNesting(100, 1, string_brace=False),
+}
+
+def GenerateLines(nb_lines, corpus='classes'):
+    """
+    Generate lines on the fly by repeating a pattern, without keeping them in memory.
+
+    Args:
+        nb_lines (int): The number of lines to generate.
+        corpus (str, optional): The pattern (a key of PATTERNS). Defaults to 'classes'.
+
+    Yields:
+        str: The generated lines.
+    """
+    pattern = PATTERNS[corpus]()
+    for i in range(nb_lines):
+        yield pattern[i % len(pattern)]
+
+def GetPeakRss():
+    """
+    Get the peak resident memory of the process.
+
+    Returns:
+        float: The peak RSS in MB.
+    """
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def Main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--lines', type=int, default=10000000, help='number of lines generated')
+    parser.add_argument('--report', type=int, default=1000000, help='number of lines between two reports')
+    parser.add_argument('--corpus', choices=list(PATTERNS), default='classes', help='generated lines')
+    args = parser.parse_args()
+
+    detector = Detector(blocks, singles)
+    start = time.perf_counter()
+    print(f'{0:>10} lines : {GetPeakRss():8.1f} MB peak RSS')
+
+    count, next_report = 0, args.report
+    for element in detector.IterElements(GenerateLines(args.lines, args.corpus)):
+        count += 1
+        if element[2] >= next_report:
+            print(f'{next_report:>10} lines : {GetPeakRss():8.1f} MB peak RSS')
+            next_report += args.report
+
+    print(f'{count} elements in {time.perf_counter() - start:.1f} s, final peak RSS {GetPeakRss():.1f} MB')
+
+if __name__ == '__main__':
+    Main()
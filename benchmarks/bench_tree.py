@@ -0,0 +1,51 @@
+"""
+Measure the Tree build and its enclosing/overlapping queries against a scan of the elements list.
+
+Usage: python -m benchmarks.bench_tree [--lines 200000] [--queries 10000]
+"""
+import argparse
+import random
+import time
+
+from jsCodeStructureDetection import Detector
+from jsCodeStructureTree import Tree
+from benchmarks.rules import blocks, singles
+from benchmarks.corpus import GetClasses, GetDeepNesting
+
+def Main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--lines', type=int, default=200000, help='number of lines of classes, after nested functions')
+    parser.add_argument('--queries', type=int, default=10000, help='number of queries of each kind')
+    args = parser.parse_args()
+
+    detector = Detector(blocks, singles)
+    lines = GetDeepNesting(50, 20, string_brace=False) + GetClasses(args.lines, 100)
+    elements = detector.GetElements(lines)
+
+    start = time.perf_counter()
+    tree = Tree(elements)
+    build_time = time.perf_counter() - start
+    depth = max(len(node.GetPath()) for node in tree)
+    print(f'Elements           : {len(elements)} ({len(lines)} lines, depth {depth})')
+    print(f'Build              : {build_time * 1000:9.1f} ms')
+
+    rand = random.Random(0)
+    queries = [rand.randrange(len(lines)) for _ in range(args.queries)]
+    for name, query, scan in (
+        ('Enclosing line', lambda line: tree.GetEnclosing(line), lambda line: [e for e in elements if e[1] <= line <= e[2]]),
+        ('Overlapping 100', lambda line: tree.GetOverlapping(line, line + 99), lambda line: [e for e in elements if e[1] <= line + 99 and e[2] >= line]),
+    ):
+        start = time.perf_counter()
+        results = [query(line) for line in queries]
+        query_time = (time.perf_counter() - start) / len(queries)
+
+        checked = queries[:100]
+        start = time.perf_counter()
+        expected = [scan(line) for line in checked]
+        scan_time = (time.perf_counter() - start) / len(checked)
+        assert [[node.ToList() for node in result] for result in results[:100]] == expected, f'{name}: different elements than the scan'
+
+        print(f'{name:<18} : {query_time * 1e6:9.1f} us/query ({1 / query_time:9.0f} queries/s)  scan {scan_time * 1e6:9.1f} us/query')
+
+if __name__ == '__main__':
+    Main()
@@ -0,0 +1,187 @@
+"""
+Generators of synthetic JavaScript used by the benchmarks, and the README sample used as reference input.
+"""
+import os
+
+SAMPLE_PATH = os.path.join(os.path.dirname(__file__), 'sample.js')
+
+def GetSampleLines():
+    """
+    Read the README sample used as reference input.
+
+    Returns:
+        list of str: The lines of the sample.
+    """
+    with open(SAMPLE_PATH, encoding='utf-8') as file:
+        return file.readlines()
+
+def GetClasses(nb_lines, methods):
+    """
+    Generate classes with documented methods until reaching a number of lines.
+
+    Args:
+        nb_lines (int): The number of lines to generate.
+        methods (int): The number of methods in each class.
+
+    Returns:
+        list of str: The generated lines.
+    """
+    lines = []
+    c = 0
+    while len(lines) < nb_lines:
+        lines.append(f'export class Generated{c} {{\n')
+        for m in range(methods):
+            lines.extend([
+                '    /*\n',
+                f'    Method {m} of the class {c}\n',
+                '    */\n',
+                f'    method{m}(value, other) {{\n',
+                '        if (value > other) {\n',
+                '            return value;\n',
+                '        }\n',
+                '        return other;\n',
+                '    }\n',
+                '\n',
+            ])
+        lines.append('}\n')
+        c += 1
+    return lines[:nb_lines]
+
+def GetDeepNesting(depth, repeat, string_brace=True):
+    """
+    Generate nested functions, each one containing an object literal and a call with arguments on several lines.
+
+    Args:
+        depth (int): The number of nested functions.
+        repeat (int): The number of times the nested functions are repeated.
+        string_brace (bool, optional): Put an open brace in a string of the object literal. It is counted as a block
+                                       open, so the functions never end and the open blocks pile up. Defaults to True.
+
+    Returns:
+        list of str: The generated lines.
+    """
+    key = '"{"' if string_brace else '"key"'
+    lines = []
+    for r in range(repeat):
+        for d in range(depth):
+            indent = '    ' * d
+            lines.append(f'{indent}function level{r}_{d}(a, b) {{\n')
+            lines.append(f'{indent}    const value = {{ key: {key}, other: [a, b] }};\n')
+            lines.append(f'{indent}    call(value,\n')
+            lines.append(f'{indent}        b);\n')
+        for d in range(depth-1, -1, -1):
+            lines.append('    ' * d + '}\n')
+        lines.append('\n')
+    return lines
+
+def GetCommentBlocks(nb_lines, size):
+    """
+    Generate huge block comments, with braces and parenthesis in their content, each one followed by a function.
+
+    Args:
+        nb_lines (int): The number of lines to generate.
+        size (int): The number of lines of each comment.
+
+    Returns:
+        list of str: The generated lines.
+    """
+    lines = []
+    c = 0
+    while len(lines) < nb_lines:
+        lines.append('/*\n')
+        lines.extend(f'    Line {k} of the comment {c}: call({k}) {{ not a block }}\n' for k in range(size))
+        lines.extend([
+            '*/\n',
+            f'function documented{c}(value) {{\n',
+            '    return value;\n',
+            '}\n',
+        ])
+        c += 1
+    return lines[:nb_lines]
+
+def GetLongArguments(nb_lines, arguments):
+    """
+    Generate functions whose arguments are on several lines, so the blocks with args wait for the parenthesis to
+    close before the open char, followed by a call and a class method with their arguments on several lines too.
+
+    Args:
+        nb_lines (int): The number of lines to generate.
+        arguments (int): The number of arguments of each function, one by line.
+
+    Returns:
+        list of str: The generated lines.
+    """
+    lines = []
+    c = 0
+    while len(lines) < nb_lines:
+        lines.append(f'function spread{c}(\n')
+        lines.extend(f'    argument{a},\n' for a in range(arguments))
+        lines.append(') {\n')
+        lines.append(f'    return combine{c}(\n')
+        lines.extend(f'        argument{a},\n' for a in range(arguments))
+        lines.append('    );\n')
+        lines.append('}\n')
+        lines.append(f'class Holder{c} {{\n')
+        lines.append('    method(\n')
+        lines.extend(f'        argument{a} = {{}},\n' for a in range(arguments))
+        lines.append('    ) {\n')
+        lines.append('        return this;\n')
+        lines.append('    }\n')
+        lines.append('}\n')
+        c += 1
+    return lines[:nb_lines]
+
+def GetLongLines(nb_lines, length):
+    """
+    Generate very long lines, as in minified code: calls, objects and arrow functions on a single line.
+
+    Args:
+        nb_lines (int): The number of lines to generate.
+        length (int): The approximate number of characters of each line.
+
+    Returns:
+        list of str: The generated lines.
+    """
+    lines = []
+    for i in range(nb_lines):
+        line = f'const minified{i} = (a) => {{'
+        k = 0
+        while len(line) < length:
+            line += f'a.f{k}({{b:[{k},(c)=>c*{k}]}});'
+            k += 1
+        lines.append(line + '};\n')
+    return lines
+
+def GetFunctionBodies(nb_lines, statements):
+    """
+    Generate functions with long bodies of plain statements (declarations, assignments, calls, conditions), as most
+    of the lines of real code, that only match the last block rules or none of them.
+
+    Args:
+        nb_lines (int): The number of lines to generate.
+        statements (int): The number of groups of statements in each function.
+
+    Returns:
+        list of str: The generated lines.
+    """
+    lines = []
+    c = 0
+    while len(lines) < nb_lines:
+        lines.append(f'function compute{c}(items, factor) {{\n')
+        lines.append('    let total = 0;\n')
+        for s in range(statements):
+            lines.extend([
+                f'    const value{s} = items[{s}] * factor;\n',
+                f'    total += value{s} - {s};\n',
+                f'    let label{s} = "item " + value{s};\n',
+                f'    if (value{s} > total) {{\n',
+                f'        total = value{s};\n',
+                '    }\n',
+                f'    results.push(label{s});\n',
+                f'    counts[label{s}] = (counts[label{s}] || 0) + 1;\n',
+            ])
+        lines.append('    return total;\n')
+        lines.append('}\n')
+        lines.append('\n')
+        c += 1
+    return lines[:nb_lines]
@@ -0,0 +1,111 @@
+"""
+The rule set of the README exemple, used by the benchmarks.
+"""
+
+singles = {
+    'comment':{
+        'element':'//',
+        'way':'startswith',
+        'position':'up'
+    },
+    'empty':{
+        'element':'',
+        'way':'==',
+        'position':'up'
+    },
+    'import':{
+        'element':'import',
+        'way':'startswith',
+        'position':'up'
+    },
+    'export':{
+        'element':'export',
+        'way':'startswith',
+        'position':'down'
+    },
+    'other':{
+        'element':'',
+        'way':'no (,),{,},/*,*/',
+        'position':'down'
+    },
+    'default':{
+        'element':'',
+        'way':'',
+        'position':'default'
+    },
+}
+
+blocks = {
+    'comment_block':{
+        'pattern': r'\/\*',
+        'have_args':False,
+        'is_inside':[],
+        'is_not_in':['comment_block'],
+        'recursive':False,
+        'open':'/*',
+        'close':'*/',
+    },
+    'class':{
+        'pattern': r'\bclass(?:\s+(\w*))?\b',   # Pattern for identify the start of the block
+        'have_args':False,                      # If args, open and close start once parenthesis close # todo improve it (veryfy if something open before the open char. If the case wait it to close)
+        'is_inside':[],                         # It is present in others defined blocks ? (Empty = all allow)
+        'is_not_in':['comment_block'],          # It can't be present in some defined blocks ? (Empty = all allow)
+        'recursive':True,                       # Do we want it's content be process ?
+        'open':'{',                             # str that open the block
+        'close':'}',
+    },
+    'function':{
+        'pattern': r'\bfunction\s+(\w+)\s*\(', 
+        'have_args':True,
+        'is_inside':[],
+        'is_not_in':['comment_block'],
+        'recursive':True,
+        'open':'{',
+        'close':'}',
+    },
+    'function_arrow':{
+        'pattern': r'\bconst\s+\(\s*(\w+)\s*=\s*\([^)]*\)\s*=>\s*',
+        'have_args':False,
+        'is_inside':[],
+        'is_not_in':['comment_block'],
+        'recursive':True,
+        'open':'(',
+        'close':')',
+    },
+    'function_arrow_':{
+        'pattern': r'\bconst\s+(\w+)\s*=\s*\([^)]*\)\s*=>\s*',
+        'have_args':False,
+        'is_inside':[],
+        'is_not_in':['comment_block'],
+        'recursive':True,
+        'open':'{',
+        'close':'}',
+    },
+    'methods':{
+        'pattern': r'\b(\w+)\s*\([^)]*\)\s*',
+        'have_args':True,
+        'is_inside':['class'],
+        'is_not_in':['methods', 'function', 'function_arrow', 'comment_block', 'function_call', 'other_multi'],
+        'recursive':False,
+        'open':'{',
+        'close':'}',
+    },
+    'other_multi':{
+        'pattern': r'\b.*\{',
+        'have_args':False,
+        'is_inside':[],
+        'is_not_in':['comment_block'],
+        'recursive':False,
+        'open':'{',
+        'close':'}',
+    },
+    'function_call':{
+        'pattern': r'\b\w+\s*\(+',
+        'have_args':False,
+        'is_inside':[],
+        'is_not_in':['comment_block'],
+        'recursive':False,
+        'open':'(',
+        'close':')',
+    }, 
+}
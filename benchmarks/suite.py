@@ -0,0 +1,147 @@
+"""
+Run GetElements on each generated corpus at growing sizes, and fail if it regresses past the stored baseline.
+
+For each corpus, the lines/sec (best of several runs) and the peak memory allocated by GetElements (traced in a
+separate run) are measured at each size, then the scaling exponent is fitted on the times. The results are written
+to a JSON file, and compared with the baseline: the run fails if the lines/sec drop or the peak memory grows by more
+than the tolerance, or if the exponent grows by more than EXPONENT_MARGIN.
+
+Usage: python -m benchmarks.suite [--cases classes ...] [--repeat 3] [--output bench_results.json]
+                                  [--baseline benchmarks/baseline.json] [--save-baseline] [--tolerance 0.3]
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+from jsCodeStructureDetection import Detector
+from benchmarks.rules import blocks, singles
+from benchmarks.corpus import GetClasses, GetDeepNesting, GetCommentBlocks, GetLongArguments, GetLongLines, GetFunctionBodies
+from benchmarks.bench_scaling import GetExponent
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+EXPONENT_MARGIN = 0.25  # Growth of the scaling exponent allowed over the baseline
+
+# Name: (generator of a number of lines, sizes)
+CASES = {
+    'classes': (lambda n: GetClasses(n, 100), [1000, 10000, 100000]),
+    'deep_nesting': (lambda n: GetDeepNesting(100, n // 501 + 1, string_brace=False)[:n], [1000, 5000, 25000]),
+    'comment_blocks': (lambda n: GetCommentBlocks(n, 1000), [1000, 10000, 100000]),
+    'long_arguments': (lambda n: GetLongArguments(n, 200), [1000, 10000, 100000]),
+    'long_lines': (lambda n: GetLongLines(n, 2000), [100, 500, 2500]),
+    'function_bodies': (lambda n: GetFunctionBodies(n, 20), [1000, 10000, 100000]),
+}
+
+def MeasureCase(detector, generator, sizes, repeat):
+    """
+    Measure GetElements on a corpus at each size.
+
+    Args:
+        detector (Detector): The compiled rules.
+        generator (callable): The corpus generator, called with a number of lines.
+        sizes (list of int): The numbers of lines.
+        repeat (int): The number of timed runs, the best one is kept.
+
+    Returns:
+        dict: The sizes, the lines/sec and the peak memory (MB) at each size, and the scaling exponent.
+    """
+    result = {'sizes': sizes, 'lines_per_sec': [], 'peak_mb': []}
+    times = []
+    for size in sizes:
+        lines = generator(size)
+
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            detector.GetElements(lines)
+            best = min(best, time.perf_counter() - start)
+        times.append(best)
+        result['lines_per_sec'].append(round(size / best))
+
+        tracemalloc.start()
+        detector.GetElements(lines)
+        result['peak_mb'].append(round(tracemalloc.get_traced_memory()[1] / 2**20, 3))
+        tracemalloc.stop()
+
+    result['exponent'] = round(GetExponent(sizes, times), 3) if len(sizes) > 1 else None
+    return result
+
+def GetRegressions(results, baseline, tolerance):
+    """
+    Compare results with a baseline, on the cases and sizes present in both.
+
+    Args:
+        results (dict): The results of the run, by case.
+        baseline (dict): The baseline results, by case.
+        tolerance (float): The fraction of lines/sec lost or peak memory gained that is allowed.
+
+    Returns:
+        list of str: The description of each regression.
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        reference = baseline[name]
+        for k, size in enumerate(result['sizes']):
+            if size not in reference['sizes']:
+                continue
+            r = reference['sizes'].index(size)
+            speed, reference_speed = result['lines_per_sec'][k], reference['lines_per_sec'][r]
+            if speed < reference_speed * (1 - tolerance):
+                regressions.append(f'{name} at {size} lines: {speed} lines/s against {reference_speed} in the baseline')
+            peak, reference_peak = result['peak_mb'][k], reference['peak_mb'][r]
+            if peak > reference_peak * (1 + tolerance):
+                regressions.append(f'{name} at {size} lines: {peak} MB peak against {reference_peak} in the baseline')
+        if None not in (result['exponent'], reference['exponent']) and result['exponent'] > reference['exponent'] + EXPONENT_MARGIN:
+            regressions.append(f'{name}: scaling exponent {result["exponent"]} against {reference["exponent"]} in the baseline')
+    return regressions
+
+def Main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--cases', nargs='+', choices=list(CASES), default=list(CASES), help='corpora to run')
+    parser.add_argument('--repeat', type=int, default=3, help='number of timed runs, the best one is kept')
+    parser.add_argument('--output', default='bench_results.json', help='results file')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='baseline file the results are compared with')
+    parser.add_argument('--save-baseline', action='store_true', help='write the results as the new baseline instead of comparing')
+    parser.add_argument('--tolerance', type=float, default=0.3, help='fraction of lines/sec lost or peak memory gained allowed')
+    args = parser.parse_args()
+
+    detector = Detector(blocks, singles)
+    results = {}
+    for name in args.cases:
+        generator, sizes = CASES[name]
+        results[name] = MeasureCase(detector, generator, sizes, args.repeat)
+        result = results[name]
+        for size, speed, peak in zip(result['sizes'], result['lines_per_sec'], result['peak_mb']):
+            print(f'{name:>15} {size:>7} lines : {speed:10} lines/s  {peak:9.1f} MB peak')
+        print(f'{name:>15} exponent : {result["exponent"]}')
+
+    report = {'python': platform.python_version(), 'machine': platform.machine(), 'cases': results}
+    with open(args.output, 'w', encoding='utf-8') as file:
+        json.dump(report, file, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+        print(f'Baseline saved in {args.baseline}')
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f'No baseline in {args.baseline}, nothing to compare')
+        return
+    with open(args.baseline, encoding='utf-8') as file:
+        baseline = json.load(file)['cases']
+
+    regressions = GetRegressions(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f'REGRESSION {regression}')
+    if regressions:
+        sys.exit(1)
+    print('No regression against the baseline')
+
+if __name__ == '__main__':
+    Main()
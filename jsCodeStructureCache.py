@@ -0,0 +1,273 @@
+import hashlib
+import json
+import os
+import struct
+import sys
+import tempfile
+from array import array
+
+try:
+    import fcntl
+except ImportError:     # Windows
+    fcntl = None
+
+from jsCodeStructureDetection import Detector
+from jsCodeStructureElements import Elements
+
+CACHE_BYTES = 1 << 28               # Default size limit of a cache directory
+CACHE_LOW_WATER = 0.9               # Fraction of the size limit kept by an eviction, so it doesn't run at each write
+CACHE_VERSION = 1                   # Version of the file format, part of the rules hash
+HEADER = struct.Struct('<4sII')     # Magic, number of elements and size of the types/names table
+SIZE_FILE = '.size'                 # Total size of the results of a directory, shared by the processes using it
+
+class Cache:
+    """
+    On-disk cache of the elements of files, around a Detector.
+
+    A result is stored under the hash of the rules and the hash of the lines, so an unchanged file is never processed
+    twice and a change of the rules (the order of the blocks and singles included) gives new keys: the old results are
+    not used anymore, and are evicted as the least recently used. The results are written to a temporary file then
+    renamed, so several processes can share the same directory. The total size of the directory is kept in a file
+    updated under a lock by each write, so the processes evict as soon as their writes together exceed the size limit
+    (without fcntl, on Windows, each process only counts its own writes since it measured the directory).
+
+    Args:
+        directory (str): The cache directory, created if missing.
+        blocks (dict): The block rules (cf GetElements).
+        singles (dict): The single-line rules (cf GetElements).
+        ignore (list of str, optional): The ignore strings (cf GetElements). Defaults to an empty list.
+        max_bytes (int, optional): The size limit of the directory. Defaults to CACHE_BYTES.
+
+    Attributes:
+        hits (int): The number of results read from the cache by this process.
+        misses (int): The number of results computed by this process.
+        size (int): The size of the directory, as of the last write of this process.
+    """
+    def __init__(self, directory, blocks, singles, ignore=[], max_bytes=CACHE_BYTES):
+        self.detector = Detector(blocks, singles, ignore)
+        self.directory = os.fspath(directory)
+        self.max_bytes = max_bytes
+        self.rules_hash = GetRulesHash(blocks, singles, ignore)
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(os.path.join(self.directory, self.rules_hash), exist_ok=True)
+        self.size = self.GetSize()
+
+    def GetElements(self, lines, compact=False):
+        """
+        Get the elements of lines from the cache, or process and store them (cf GetElements).
+
+        Args:
+            lines (iterable of str): The lines to be analyzed.
+            compact (bool, optional): Return an Elements instead of a list of lists. Defaults to False.
+
+        Returns:
+            list of list or Elements: A list of identified elements with their type, start index, end index, and name.
+        """
+        lines = list(lines)
+        path = os.path.join(self.directory, self.rules_hash, GetContentHash(lines))
+
+        try:
+            with open(path, 'rb') as file:
+                elements = Load(file.read())
+            os.utime(path)      # Most recently used
+            self.hits += 1
+        except (OSError, ValueError):
+            # Missing, evicted meanwhile or partially written by an old version
+            elements = self.detector.GetElements(lines)
+            self.misses += 1
+            self.Store(path, Dump(elements))
+
+        if compact:
+            return Elements.FromElements(elements, self.detector.blocks_key + self.detector.singles_key)
+        return elements
+
+    def Store(self, path, data):
+        """
+        Write a result atomically, then evict the least recently used results if the size limit is exceeded.
+
+        Args:
+            path (str): The result path.
+            data (bytes): The result.
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                file.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+
+        self.AddSize(len(data))
+
+    def AddSize(self, size):
+        """
+        Add the size of a written result to the total size of the directory, and evict the least recently used results
+        if it exceeds the size limit. The total is read and written under a lock, so the writes of all the processes
+        are counted.
+
+        Args:
+            size (int): The size of the result.
+        """
+        if fcntl is None:
+            self.size += size
+            if self.size > self.max_bytes:
+                self.Evict()
+            return
+
+        try:
+            with open(os.path.join(self.directory, SIZE_FILE), 'a+', encoding='ascii') as file:
+                fcntl.flock(file, fcntl.LOCK_EX)
+                file.seek(0)
+                try:
+                    self.size = int(file.read()) + size
+                except ValueError:
+                    self.size = self.GetSize()  # New file, the result included
+                if self.size > self.max_bytes:
+                    self.Evict()
+                file.truncate(0)
+                file.write(str(self.size))
+        except OSError:
+            pass
+
+    def GetSize(self):
+        """
+        Get the size of the results of the directory, for all the rule sets.
+
+        Returns:
+            int: The size in bytes.
+        """
+        return sum(size for _, _, size in self.GetEntries())
+
+    def GetEntries(self):
+        """
+        List the results of the directory, for all the rule sets.
+
+        Returns:
+            list of tuple: The (last use, path, size) of each result.
+        """
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name == SIZE_FILE:
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue    # Removed by another process
+                entries.append((stat.st_mtime, path, stat.st_size))
+        return entries
+
+    def Evict(self):
+        """
+        Remove the least recently used results until the directory is under CACHE_LOW_WATER of its size limit.
+        The size is measured again, as the total may have drifted (a result written by two processes is counted twice).
+        """
+        entries = sorted(self.GetEntries())
+        self.size = sum(size for _, _, size in entries)
+        target = self.max_bytes * CACHE_LOW_WATER
+        for _, path, size in entries:
+            if self.size <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass    # Already removed by another process
+            self.size -= size
+
+    def Clear(self):
+        """
+        Remove all the results of the directory.
+        """
+        for path in [path for _, path, _ in self.GetEntries()] + [os.path.join(self.directory, SIZE_FILE)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self.size = 0
+
+def GetRulesHash(blocks, singles, ignore):
+    """
+    Get a canonical hash of a rule set. The order of the blocks and of the singles is kept as it changes the result,
+    the order of the keys inside a rule is not.
+
+    Args:
+        blocks (dict): The block rules.
+        singles (dict): The single-line rules.
+        ignore (list of str): The ignore strings.
+
+    Returns:
+        str: The hexadecimal hash.
+    """
+    rules = [CACHE_VERSION, list(blocks.items()), list(singles.items()), list(ignore)]
+    canonical = json.dumps(rules, sort_keys=True, separators=(',', ':'), default=repr)
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+def GetContentHash(lines):
+    """
+    Get the hash of lines. The lines lengths are hashed too, so a different split of the same text has another hash.
+
+    Args:
+        lines (list of str): The lines.
+
+    Returns:
+        str: The hexadecimal hash.
+    """
+    content = hashlib.blake2b(''.join(lines).encode('utf-8', 'surrogatepass'), digest_size=20)
+    content.update(array('q', map(len, lines)).tobytes())
+    return content.hexdigest()
+
+def Dump(elements):
+    """
+    Encode elements in the compact format of the cache: a header, the table of the types and names,
+    then 4 int32 by element (type index, start, end, name index or -1 for None).
+
+    Args:
+        elements (list of list): The elements (type, start, end, name).
+
+    Returns:
+        bytes: The encoded elements.
+    """
+    types, names = {}, {}
+    values = array('i')
+    for type_, start, end, name in elements:
+        values.extend((types.setdefault(type_, len(types)), start, end, -1 if name is None else names.setdefault(name, len(names))))
+    if sys.byteorder == 'big':
+        values.byteswap()   # Stored in little endian
+
+    table = json.dumps([list(types), list(names)], separators=(',', ':')).encode()
+    return HEADER.pack(b'JSCS', len(elements), len(table)) + table + values.tobytes()
+
+def Load(data):
+    """
+    Decode elements encoded by Dump.
+
+    Args:
+        data (bytes): The encoded elements.
+
+    Returns:
+        list of list: The elements (type, start, end, name).
+
+    Raises:
+        ValueError: If the data is not a complete result.
+    """
+    if len(data) < HEADER.size:
+        raise ValueError('Truncated result')
+    magic, count, table_size = HEADER.unpack_from(data)
+    if magic != b'JSCS' or len(data) != HEADER.size + table_size + 16*count:
+        raise ValueError('Invalid result')
+
+    types, names = json.loads(data[HEADER.size:HEADER.size + table_size])
+    values = array('i')
+    values.frombytes(data[HEADER.size + table_size:])
+    if sys.byteorder == 'big':
+        values.byteswap()
+
+    it = iter(values)
+    return [[types[type_], start, end, None if name < 0 else names[name]] for type_, start, end, name in zip(it, it, it, it)]
@@ -0,0 +1,141 @@
+"""
+Client of the analysis daemon (jsCodeStructureServer), to get the elements of files from a short-lived process.
+
+Only the modules needed to talk to the daemon are imported (not the detection and NumPy), so a call costs the start
+of Python and a round trip to the daemon, whose rules are already compiled.
+
+The default socket is in $XDG_RUNTIME_DIR, else in a directory of /tmp only the user can access. The client only
+connects to a socket of the user, in a directory where another user can't replace it (cf CheckSocket).
+
+Usage: python jsCodeStructureClient.py paths [paths ...] [--rules benchmarks.rules] [--socket PATH]
+"""
+import json
+import os
+import socket
+import stat
+import sys
+
+def GetSocketPath():
+    """
+    Get the default socket of the daemon: $JSCS_SOCKET, else in $XDG_RUNTIME_DIR, else in a directory of the user in /tmp.
+
+    Returns:
+        str: The socket path.
+    """
+    if os.environ.get('JSCS_SOCKET'):
+        return os.environ['JSCS_SOCKET']
+    if os.environ.get('XDG_RUNTIME_DIR'):
+        return os.path.join(os.environ['XDG_RUNTIME_DIR'], 'jsCodeStructure.sock')
+    return os.path.join('/tmp', f'jsCodeStructure-{os.getuid()}', 'daemon.sock')
+
+SOCKET_PATH = GetSocketPath()   # Default socket of the daemon
+
+def CheckDirectory(directory):
+    """
+    Check that another user can't add or replace the entries of a directory: it belongs to the user (or root), and
+    only its owner can write in it, or only the owner of an entry can remove it (sticky bit, as /tmp).
+
+    Args:
+        directory (str): The directory.
+
+    Raises:
+        Exception: If another user can change its entries.
+    """
+    info = os.stat(directory)
+    if info.st_uid not in (os.getuid(), 0):
+        raise Exception(f'The directory {directory} belongs to another user.')
+    if info.st_mode & (stat.S_IWGRP | stat.S_IWOTH) and not info.st_mode & stat.S_ISVTX:
+        raise Exception(f'The directory {directory} can be written by other users.')
+
+def CheckSocket(socket_path):
+    """
+    Check that a socket was bound by the user, so the files and their content are not sent to another user.
+
+    Args:
+        socket_path (str): The socket.
+
+    Raises:
+        OSError: If there is no socket.
+        Exception: If the socket or its directory belongs to another user (cf CheckDirectory).
+    """
+    CheckDirectory(os.path.dirname(os.path.abspath(socket_path)))
+    info = os.stat(socket_path)
+    if not stat.S_ISSOCK(info.st_mode) or info.st_uid != os.getuid():
+        raise Exception(f'{socket_path} is not a socket of the user.')
+
+def RequestElements(requests, socket_path=SOCKET_PATH):
+    """
+    Send requests to the daemon and wait for their responses. The requests sent together are batched by the daemon.
+
+    Args:
+        requests (list of dict): The requests, each one with a 'path' (of a file the daemon can read) or a 'content'
+                                 (the text of a file), and optionally the 'rules' (the name of a rule set of the
+                                 daemon, its first one by default) and the 'encoding' of the path.
+        socket_path (str, optional): The socket of the daemon. Defaults to SOCKET_PATH.
+
+    Returns:
+        list of dict: The response of each request, in order: {'elements': list of list} or {'error': str}.
+
+    Raises:
+        OSError: If no daemon listens on the socket.
+        Exception: If the socket was not bound by the user (cf CheckSocket).
+    """
+    CheckSocket(socket_path)
+    responses = [None] * len(requests)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+        client.sendall(b''.join(json.dumps(dict(request, id=k)).encode() + b'\n' for k, request in enumerate(requests)))
+        client.shutdown(socket.SHUT_WR)     # No more requests, the daemon answers then close
+
+        # The responses come in the order they are done
+        with client.makefile('rb') as file:
+            for line in file:
+                response = json.loads(line)
+                responses[response.pop('id')] = response
+    return responses
+
+def StopServer(socket_path=SOCKET_PATH):
+    """
+    Ask the daemon to stop.
+
+    Args:
+        socket_path (str, optional): The socket of the daemon. Defaults to SOCKET_PATH.
+    """
+    CheckSocket(socket_path)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+        client.sendall(json.dumps({'stop': True}).encode() + b'\n')
+
+def Main(argv):
+    # The options are read by hand, as importing argparse cost more than the round trip
+    if not argv or '-h' in argv or '--help' in argv:
+        print(__doc__.strip())
+        return 0
+
+    paths, options = [], {'--rules': None, '--socket': SOCKET_PATH}
+    argv = iter(argv)
+    for arg in argv:
+        if arg in options:
+            options[arg] = next(argv, None)
+        else:
+            paths.append(arg)
+
+    requests = [{'path': os.path.abspath(path)} for path in paths]
+    if options['--rules']:
+        requests = [dict(request, rules=options['--rules']) for request in requests]
+
+    try:
+        responses = RequestElements(requests, options['--socket'])
+    except OSError as e:
+        print(f'No daemon on {options["--socket"]} ({e}), start it with: python jsCodeStructureServer.py', file=sys.stderr)
+        return 1
+    except Exception as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    for path, response in zip(paths, responses):
+        print(json.dumps({'path': path, **response}))
+    return 0 if all('elements' in response for response in responses) else 1
+
+if __name__ == '__main__':
+    sys.exit(Main(sys.argv[1:]))
@@ -1,423 +1,889 @@
-import re
-import numpy as np
-
-def GetElements(lines, blocks, singles, ignore=[]):
-    """
-    Process and identify elements within a list of lines based on defined block and single-line patterns.
-
-    Args:
-        lines (list of str): The list of lines to be analyzed.
-        blocks (dict): A dictionary defining block types with their corresponding patterns and rules.
-                       Each key represents a block type, and the value is a dictionary with the following keys:
-                       - 'pattern' (str): The regex pattern to identify the block start.
-                       - 'open' (str): The character indicating the start of the block's content.
-                       - 'close' (str): The character indicating the end of the block's content.
-                       - 'have_args' (bool): Whether the block can contain arguments (e.g., within parentheses).
-                       - 'recursive' (bool): Whether the block can be nested within the same block type.
-                       - 'is_not_in' (list of str): Block types that cannot contain this block type. (empty = all)
-                       - 'is_inside' (list of str): Block types that must contain this block type. (empty = all)
-        singles (dict): A dictionary defining single-line types with their corresponding patterns and rules.
-                        Each key represents a single-line type, and the value is a dictionary with the following keys:
-                        - 'element' (str): The string or pattern to identify the single-line element.
-                        - 'position' (str): The expected position of the element (None, 'up', 'down', or 'default').
-                        - 'way' (str): The method to verify the element ('==', 'startswith', 'endswith', 'in', or custom).
-        ignore (list of str, optional): A list of strings or patterns to ignore during the analysis. Defaults to an empty list.
-
-    Returns:
-        list of list: A list of identified elements, where each element is a list containing:
-                      - type (str): The type of the element (block or single).
-                      - start (int): The start line index of the element.
-                      - end (int): The end line index of the element.
-                      - name (str or None): The name or identifier of the element, if applicable.
-    """
-    block_parenthesis = [True, None]    # Permite to know if we are in arguments lines (in_arguments ?, the type)
-    blocks_key = list(blocks.keys())    # Get a list of the blocks key
-    singles_key = list(singles.keys())  # Get a list of the single elements key
-
-    def Main(lines):
-        """
-        Main processing function that iterates through lines to identify and categorize elements.
-
-        Args:
-            lines (list of str): The list of lines to be processed.
-
-        Returns:
-            list of list: A list of identified elements with their type, start index, end index, and name.
-        """
-        elements = []                               # List that will contain the result (type, start, end, name)
-
-        # in_ Permite to know what block/single is started
-        in_ = {key:[] for key in blocks_key}        # For the blocks, we init it with an empty list (each elements = a block start)
-        in_.update({key:0 for key in singles_key})  # For the sungle, a simple integer 
-
-        # Track the past types
-        prev_type = None
-        prev_block_type = None
-
-        for i, line in enumerate(lines):
-            # Get the line type
-            type_ = DefineType(line, in_)
-
-            # Update the blocks
-            elements, in_ = UpdateBlocks(elements, in_, i, line)
-
-            # If the type is defined and (it not have a previous block or the previous block is recursite or the previous block is empty)
-            if type_ is not None and (prev_block_type is None or blocks[prev_block_type]['recursive'] is True or len(in_[prev_block_type])==0):
-                
-                elements, in_ = HandleType(elements, type_, in_, i, line)   # Handle the current detected type 
-                in_ = Reinit(in_, type_)                                    # Reinit the single types
-
-                # Update the previous block type if need
-                if type_ in blocks_key:
-                    prev_block_type = type_
-            
-            prev_type = type_   # Update the prev type
-
-        return elements
-
-
-    def UpdateBlocks(elements, in_, i, line):
-        """
-        Update the status of block elements based on the current line and modify their start/end indexes accordingly.
-
-        Args:
-            elements (list of list): The list of currently identified elements.
-            in_ (dict): A dictionary tracking the current state of blocks and singles.
-            i (int): The current line index being processed.
-            line (str): The current line content.
-
-        Returns:
-            tuple: Updated elements and state dictionary after processing the current line.
-        """
-        def Del(list_):
-            """
-            Delete entries from a list based on specific conditions.
-
-            Args:
-                list_ (list of int): A list representing block counts to be potentially modified.
-
-            Returns:
-                list of int: The modified list after deletions.
-            """
-            last = 1
-            # For each list elements, get the index where the blocks are end up
-            for idx in range(len(list_)):   
-                if list_[idx]>0:    # So if >0 (in process), stop there
-                    last = idx
-
-            # Reverse it, and delete the indexs of the already process end up
-            for idx in sorted(np.arange(last), reverse=True):
-                del list_[idx]
-            return list_
-
-        def UpdateState(line, nb_open_close, line_idx, type_, blocks, block_idx, in_, nb_blocks_s, elements, update_type):
-            """
-            Update the state of a block element based on whether it has reached its end or not.
-
-            Args:
-                line (str): The line being processed to check for block end conditions.
-                nb_open_close (int): The current count of open/close indicators for the block.
-                line_idx (int): The current line index being processed.
-                type_ (str): The type of the block element being updated.
-                blocks (dict): A dictionary defining block types and their characteristics, including open and close patterns.
-                block_idx (int): The index of the block in the current state.
-                in_ (dict): A dictionary tracking the current state of blocks and single-line elements.
-                nb_blocks_s (int): The total number of blocks of this type currently tracked.
-                elements (list of list): The list of currently identified elements, including their start and end positions.
-                update_type (str): The type of element to update if the current block is not yet finished.
-
-            Returns:
-                tuple: Updated elements and state dictionary after processing the current line.
-                    - elements (list of list): The updated list of identified elements.
-                    - in_ (dict): The updated state dictionary with modified block information.
-            """
-            is_endup, _ = IsEndUp(line, nb_open_close, add=blocks[type_]['open'], remove=blocks[type_]['close']) # Get the new advancement
-            if is_endup is True:                            # If end up
-                if block_idx == 0:                          # If it's the oldes block, delete
-                    in_[type_][block_idx] = 0
-                    in_[type_] = Del(in_[type_])
-                else:                                       # If it's not the oldest block, mark it as end up
-                    in_[type_][block_idx] = 0
-                elements = UpdateLastIndex(elements, type_, line_idx, num=(nb_blocks_s-1)-block_idx)    # Update the elements
-            else:                                           # If block not end up update it's advancement
-                in_[update_type][block_idx] = is_endup      
-            return elements, in_
-
-
-        line_content = GetNormalizedLine(line)
-        
-        for type_ in blocks_key:        # For each block types
-            n = len(in_[type_])         # Get the numner of process blocks
-            for j in range(n-1, -1, -1):# For each of this blocks (starting by the most recent)
-                if block_parenthesis[0] is not True and type_ == block_parenthesis[1] and j == n-1:                         # If arguments are started and not end up and it's the last item
-                    block_parenthesis[0], idx_e = IsEndUp(line=line_content, n=block_parenthesis[0], add='(', remove=')')   # Check if end up at this line or get the new advancement
-                    if block_parenthesis[0] is True:                                                                        # If this time it's end up
-                        start_line = line_content[idx_e:]                                                                   # Get the rest of the line after this args
-                        elements, in_ = UpdateState(line=start_line, nb_open_close=0, line_idx=i, type_=type_, blocks=blocks, block_idx=j, in_=in_, nb_blocks_s=n, elements=elements, update_type=block_parenthesis[1])
-                
-                elif in_[type_][j]>0:                                                                                   # If the block is not end up
-                    prev = in_[type_][j]                                                                                # Save it's current state
-                    elements, in_ = UpdateState(line=line_content, nb_open_close=prev, line_idx=i, type_=type_, blocks=blocks, block_idx=j, in_=in_, nb_blocks_s=n, elements=elements, update_type=type_)
-
-        return elements, in_
-
-    def IsEndUp(line, n, add='{', remove='}'):
-        """
-        Determine if a line marks the end of a block based on a counter for opening and closing characters.
-
-        Args:
-            line (str): The line to be checked.
-            n (int): The current count of open block indicators.
-            add (str, optional): The character that indicates an opening. Defaults to '{'.
-            remove (str, optional): The character that indicates a closing. Defaults to '}'.
-
-        Returns:
-            tuple: A boolean indicating if the block ends on this line, and the final index examined.
-        """
-        have_change = False                     # Bool to know if a change have occur
-        size_max = max(len(add), len(remove))   # The size_max between the opening and closing
-
-        # Check the line size
-        if len(line)<size_max:
-            return n, len(line)
-
-        i = 0
-        while i < len(line)-(size_max-1):       # While the end of the line is not reached
-            # Get the samples
-            sample_add = line[i: i+len(add)]        
-            sample_remove = line[i: i+len(remove)]
-
-            if sample_add == add:   # If add
-                n+=1                # Add one element
-                have_change = True  # have_change is true
-                i+=len(add)-1       # pass the len of the add element
-            elif sample_remove == remove and n-1>=0:
-                n-=1
-                have_change = True
-                i+=len(remove)-1
-            
-            # If a change and we are at 0, the end is reach
-            if n == 0 and have_change:
-                return True, i + size_max - 1
-
-            i+=1    # If no end, pass to the next char
-        return n, i # Return the advancement
-
-    def DefineType(line, in_):
-        """
-        Define the type of the current line (block, single, or none) based on the provided patterns.
-
-        Args:
-            line (str): The line to be analyzed.
-            in_ (dict): A dictionary tracking the current state of blocks and singles.
-
-        Returns:
-            str or None: The identified type of the line or None if no type is matched.
-        """
-        line_content = GetNormalizedLine(line)
-
-        # Check the single types that need to be check before the blocks
-        for type_, values in singles.items():
-            if values['position'] == 'up' and VerifyType(string=line_content, element=values['element'], way=values['way']):
-                return type_
-        
-        # Check the blocks types
-        for type_, values in blocks.items():
-            pattern = values['pattern']
-            # If match and not ignore pattern
-            if re.search(pattern, line_content) and all(ign not in line_content for ign in ignore): 
-                # If the block is in or not in some blocks
-                if all(len(in_[no_type])==0 for no_type in blocks[type_]['is_not_in']) and all(len(in_[no_type])>0 for no_type in blocks[type_]['is_inside']):
-                    return type_
-
-        # Check the single types that need to be check after the blocks
-        for type_, values in singles.items():
-            if values['position'] == 'down' and VerifyType(string=line_content, element=values['element'], way=values['way']):
-                return type_
-        
-        # default blocks, not very usefull
-        for type_, values in singles.items():
-            if values['position'] == 'default':
-                return type_
-
-        return None
-
-    def VerifyType(string, element, way):
-        """
-        Verify if a string matches a specific type based on the defined method.
-
-        Args:
-            string (str): The string to be checked.
-            element (str): The element or pattern to match against.
-            way (str): The method of verification ('==', 'startswith', 'endswith', 'in', or custom).
-
-        Returns:
-            bool: True if the string matches the specified method, otherwise False.
-        """
-        if way == '==':
-            return string == element
-        elif way == 'startswith':
-            return string.startswith(element)
-        elif way == 'endswith':
-            return string.endswith(element)
-        elif way == 'in':
-            return string in element
-        elif way.startswith('no '):
-            new_way = way[3:].split(',')
-            return all(char not in string for char in new_way[3:])
-        else:
-            raise Exception(f'The way {way} is not handle.')
-
-    def UpdateLastIndex(elements, type_, new_idx, num=0):
-        """
-        Update the end index of the last occurrence of a specific element type.
-
-        Args:
-            elements (list of list): The list of currently identified elements.
-            type_ (str): The type of element to be updated.
-            new_idx (int): The new end index for the element.
-            num (int, optional): The specific occurrence to update if there are multiple. Defaults to 0.
-
-        Returns:
-            list of list: The updated list of elements with modified end indexes.
-        """
-        found = False   # Verify if the target as been found
-        count = 0       # The number of occurence until reach the num desire
-
-        for j in range(len(elements)-1, -1, -1):    # For each elements (reverse order)
-            if elements[j][0] == type_:             # If it's the desire type
-                if count == num:                    # And it's the desire num
-                    elements[j][2] = new_idx        # Update its index
-                    found = True                    # Found to true
-                    break                           # Stop the process
-                else:                               # If it's not the good num
-                    count +=1                       # Just continue until found it
-                
-        # Error if element not found
-        if found is False:
-            raise Exception('End block comments detected line ', i, ' but no start found.')
-
-        return elements
-
-    def HandleType(elements, type_, in_, i, line):
-        """
-        Handle the processing of a specific type by updating elements and state based on the line.
-
-        Args:
-            elements (list of list): The list of currently identified elements.
-            type_ (str): The type of element being processed.
-            in_ (dict): A dictionary tracking the current state of blocks and singles.
-            i (int): The current line index being processed.
-            line (str): The current line content.
-
-        Returns:
-            tuple: Updated elements and state dictionary after processing the current line.
-        """
-        line_content = GetNormalizedLine(line)
-
-        # If the element is a single line
-        if type_ in singles_key:
-            # If it's the first one, add it
-            if in_[type_] == 0:
-                elements.append([type_, i, i,  None])
-                in_[type_] += 1
-            # If it make more than a line with this type, update the last occurence
-            else:
-                elements[-1][2] = i
-        
-        # If it's a block
-        elif type_ in blocks_key:
-            n_parenthesis, idx_e = IsEndUp(line=line_content, n=0, add='(', remove=')') # Init the parenthesis
-
-            # If have args, add the args detection
-            if blocks[type_]['have_args']:
-                block_parenthesis[0] = n_parenthesis
-            # If not, ignore it
-            else:
-                block_parenthesis[0] = True
-                idx_e = 0
-
-            block_parenthesis[1] = type_
-
-            if block_parenthesis[0] is True:        # If no args or args end up
-                start_line = line_content[idx_e:]   # Get the line without and update the block state
-                is_endup, idx_e = IsEndUp(line=start_line, n=0, add=blocks[type_]['open'], remove=blocks[type_]['close'])
-
-                # If the block is not end up, we add it to the process one
-                if is_endup is not True:
-                    in_[type_].append(is_endup)
-
-            # If the args are not end up, current block process is at 0 (but not end up)
-            else:
-                in_[type_].append(0)
-
-            elements.append([type_, i, i,  GetName(type_, line_content)]) # Add the new block elements
-
-        return elements, in_
-
-    def GetName(type_, line):
-        """
-        Extract the name or identifier of a block element from the line using its defined pattern.
-
-        Args:
-            type_ (str): The type of the block element.
-            line (str): The line content to extract the name from.
-
-        Returns:
-            str or None: The extracted name or None if no name is found.
-        """
-        match = re.search(blocks[type_]['pattern'], line)
-
-        if match:
-            name = match.group(1) if len(match.groups()) >0 else None
-            return name if name is not None else ''
-        else:
-            return None
-
-    def Reinit(in_, type_):
-        """
-        Reinitialize the state of single-line elements, setting their counters to zero except for the current type.
-
-        Args:
-            in_ (dict): The current state dictionary.
-            type_ (str): The type that should not be reset.
-
-        Returns:
-            dict: The reinitialized state dictionary.
-        """
-        for single in singles_key:
-            if type_ != single:
-                in_[single] = 0
-
-        return in_
-
-    return Main(lines)
-
-def DisplayElements(elements):
-    """
-    Print each element from the list of identified elements.
-
-    Args:
-        elements (list of list)
-    
-    Returns:
-        None: This function does not return any value. It prints the elements to the standard output.
-    """
-    for element in elements:
-        print(element)
-
-def GetNormalizedLine(line):
-    """
-    Normalize a line by removing quoted substrings and extra whitespace.
-
-    Args:
-        line (str): The line of text to be normalized.
-
-    Returns:
-        str: The normalized line with quoted substrings removed and whitespace reduced to single spaces.
-    """
-    normalized_line = re.sub(r"'[^']*'|\"[^\"]*\"", "", line)
-
-    normalized_line = ' '.join(normalized_line.split()).strip()
-    
+import re
+from itertools import islice
+from operator import itemgetter
+import numpy as np
+
+try:
+    from re import _parser as sre_parse, _constants as sre_constants
+except ImportError:     # Python < 3.11
+    import sre_parse, sre_constants
+
+from jsCodeStructureElements import Elements
+from jsCodeStructureTree import Tree
+
+BLOCK_KEYS = ('pattern', 'open', 'close', 'have_args', 'recursive', 'is_not_in', 'is_inside')   # Keys required by each block rule
+SINGLE_KEYS = ('element', 'position', 'way')                                                        # Keys required by each single rule
+SINGLE_POSITIONS = (None, 'up', 'down', 'default')                                                  # Allowed single positions
+SCALAR_LENGTH = 64                                                                                  # Line length under which BracketDepth rescan the line instead of searching with NumPy
+CHUNK_LINES = 4096                                                                                  # Number of lines normalized and measured together when streaming
+
+def GetElements(lines, blocks, singles, ignore=[], compact=False, tree=False):
+    """
+    Process and identify elements within a list of lines based on defined block and single-line patterns.
+
+    Args:
+        lines (list of str): The list of lines to be analyzed.
+        blocks (dict): A dictionary defining block types with their corresponding patterns and rules.
+                       Each key represents a block type, and the value is a dictionary with the following keys:
+                       - 'pattern' (str): The regex pattern to identify the block start.
+                       - 'open' (str): The character indicating the start of the block's content.
+                       - 'close' (str): The character indicating the end of the block's content.
+                       - 'have_args' (bool): Whether the block can contain arguments (e.g., within parentheses).
+                       - 'recursive' (bool): Whether the block can be nested within the same block type.
+                       - 'is_not_in' (list of str): Block types that cannot contain this block type. (empty = all)
+                       - 'is_inside' (list of str): Block types that must contain this block type. (empty = all)
+        singles (dict): A dictionary defining single-line types with their corresponding patterns and rules.
+                        Each key represents a single-line type, and the value is a dictionary with the following keys:
+                        - 'element' (str): The string or pattern to identify the single-line element.
+                        - 'position' (str): The expected position of the element (None, 'up', 'down', or 'default').
+                        - 'way' (str): The method to verify the element ('==', 'startswith', 'endswith', 'in', or custom).
+        ignore (list of str, optional): A list of strings or patterns to ignore during the analysis. Defaults to an empty list.
+        compact (bool, optional): Return the elements as an Elements (arrays and interned tables) instead of a list of lists. Defaults to False.
+        tree (bool, optional): Return the elements as a Tree (nesting and interval index) instead of a list of lists. Defaults to False.
+
+    Returns:
+        list of list: A list of identified elements, where each element is a list containing:
+                      - type (str): The type of the element (block or single).
+                      - start (int): The start line index of the element.
+                      - end (int): The end line index of the element.
+                      - name (str or None): The name or identifier of the element, if applicable.
+
+    Note:
+        The rules are compiled at each call. To process many files with the same rules, build a Detector once
+        and call its GetElements method instead.
+    """
+    return Detector(blocks, singles, ignore).GetElements(lines, compact, tree)
+
+def IterElements(lines, blocks, singles, ignore=[]):
+    """
+    Stream the elements of any iterable of lines (an open file, a pipe, ...) based on defined block and single-line patterns.
+
+    Each element [type, start, end, name] is yielded as soon as it can't change anymore, so the memory is bounded by
+    the open blocks and not by the length of the input. The elements are yielded in the order they end up,
+    sort them by start to get the order of GetElements.
+
+    Args:
+        lines (iterable of str): The lines to be analyzed.
+        blocks (dict): The block rules (cf GetElements).
+        singles (dict): The single-line rules (cf GetElements).
+        ignore (list of str, optional): The ignore strings (cf GetElements). Defaults to an empty list.
+
+    Yields:
+        list: The identified elements (type, start, end, name).
+    """
+    return Detector(blocks, singles, ignore).IterElements(lines)
+
+class Detector:
+    """
+    Compiled version of a blocks/singles/ignore rule set, reusable over any number of files.
+
+    The rules are validated once, the block patterns are compiled once and the singles 'way' are resolved
+    to callables once, so processing a file no longer re-interprets the rule dicts on every line.
+
+    Args:
+        blocks (dict): The block rules (cf GetElements).
+        singles (dict): The single-line rules (cf GetElements).
+        ignore (list of str, optional): The strings that prevent a line from being a block start. Defaults to an empty list.
+        vectorized (bool, optional): Compute the blocks depth with NumPy over the whole file (BracketDepth) instead of
+                                     rescanning each line for each open block (LineDepth). Defaults to True.
+
+    Raises:
+        Exception: If a rule is malformed (missing key, unknown position or way, invalid pattern, unknown block reference).
+    """
+    def __init__(self, blocks, singles, ignore=[], vectorized=True):
+        CheckRules(blocks, singles, ignore)
+
+        self.blocks = blocks
+        self.singles = singles
+        self.ignore = list(ignore)
+        self.ignore_pattern = re.compile('|'.join(re.escape(ign) for ign in self.ignore)) if self.ignore else None   # One search for all the ignore strings
+        self.blocks_key = list(blocks.keys())       # Get a list of the blocks key
+        self.singles_key = list(singles.keys())     # Get a list of the single elements key
+
+        # Singles checked before and after the blocks, with their 'way' resolved to a callable
+        self.singles_up = [(type_, GetVerifier(values['element'], values['way'])) for type_, values in singles.items() if values['position'] == 'up']
+        self.singles_down = [(type_, GetVerifier(values['element'], values['way'])) for type_, values in singles.items() if values['position'] == 'down']
+
+        # The first default single (the only one that can be returned)
+        self.single_default = next((type_ for type_, values in singles.items() if values['position'] == 'default'), None)
+
+        # Blocks in priority order: (type, compiled pattern, keyword, is_not_in, is_inside)
+        # The pattern is only searched on the lines containing its keyword, a literal without which it can't match
+        self.block_rules = [(type_, re.compile(values['pattern']), GetKeyword(values['pattern']), tuple(values['is_not_in']), tuple(values['is_inside'])) for type_, values in blocks.items()]
+
+        # The open/close pairs whose depth is followed (the arguments parenthesis included)
+        self.pairs = list(dict.fromkeys([('(', ')')] + [(values['open'], values['close']) for values in blocks.values()]))
+        self.vectorized = vectorized
+
+    def GetElements(self, lines, compact=False, tree=False):
+        """
+        Process and identify elements within a list of lines (cf GetElements).
+
+        Args:
+            lines (list of str): The list of lines to be analyzed.
+            compact (bool, optional): Return an Elements instead of a list of lists. Defaults to False.
+            tree (bool, optional): Return a Tree instead of a list of lists. Defaults to False.
+
+        Returns:
+            list of list, Elements or Tree: A list of identified elements with their type, start index, end index, and name.
+
+        Raises:
+            Exception: If both compact and tree are asked.
+        """
+        return self.CollectElements(self.IterElements(lines), compact, tree)
+
+    def CollectElements(self, elements, compact=False, tree=False):
+        """
+        Gather streamed elements in the form asked to GetElements.
+
+        Args:
+            elements (iterable of list): The elements, in the order they end up (cf IterElements).
+            compact (bool, optional): Return an Elements instead of a list of lists. Defaults to False.
+            tree (bool, optional): Return a Tree instead of a list of lists. Defaults to False.
+
+        Returns:
+            list of list, Elements or Tree: The elements by start.
+
+        Raises:
+            Exception: If both compact and tree are asked.
+        """
+        if compact and tree:
+            raise Exception('The elements can be compact or a tree, not both.')
+        if tree:
+            return Tree(elements)
+
+        # The types codes are the same for all the files of a detector
+        if compact:
+            return Elements.FromElements(elements, self.blocks_key + self.singles_key, sort=True)
+
+        # A line start at most one element, so the start order is the order the elements are found
+        return sorted(elements, key=itemgetter(1))
+
+    def IterElements(self, lines):
+        """
+        Stream the elements of an iterable of lines, yielding each one as soon as it can't change anymore (cf IterElements).
+
+        Args:
+            lines (iterable of str): The lines to be analyzed.
+
+        Returns:
+            iterator of list: The identified elements (type, start, end, name), in the order they end up.
+        """
+        # Normalize the lines by chunks, once for all the steps
+        lines = iter(lines)
+        chunks = iter(lambda: [GetNormalizedLine(line) for line in islice(lines, CHUNK_LINES)], [])
+        return self.IterNormalizedElements(chunks)
+
+    def IterNormalizedElements(self, chunks):
+        """
+        Stream the elements of chunks of normalized lines (cf GetNormalizedLine), the chunks following each other in the file.
+
+        Args:
+            chunks (iterable of list of str): The normalized lines, by chunks.
+
+        Yields:
+            list: The identified elements (type, start, end, name), in the order they end up.
+        """
+        state = ParseState(self.blocks_key, self.singles_key)
+        i = 0
+
+        for lines_content in chunks:
+            # Get the blocks depth of the chunk
+            depth = self.GetDepth(lines_content, first=i)
+
+            for line_content in lines_content:
+                self.ProcessLine(state, depth, i, line_content)
+                i += 1
+                if state.done:
+                    yield from state.done
+                    state.done = []
+
+        yield from state.Close()
+
+    def GetDepth(self, lines_content, first=0):
+        """
+        Get the blocks depth of normalized lines, with the engine chosen at the creation of the detector.
+
+        Args:
+            lines_content (list of str): The normalized lines.
+            first (int, optional): The index of the first line. Defaults to 0.
+
+        Returns:
+            BracketDepth or LineDepth: The blocks depth of the lines.
+        """
+        return BracketDepth(lines_content, self.pairs, first=first) if self.vectorized else LineDepth(lines_content, first=first)
+
+    def ProcessLine(self, state, depth, i, line_content):
+        """
+        Process one line: define its type, update the open blocks and handle the new element.
+
+        Args:
+            state (ParseState): The parser state, updated in place.
+            depth (BracketDepth or LineDepth): The blocks depth of the file.
+            i (int): The current line index being processed.
+            line_content (str): The normalized line.
+        """
+        # Get the line type
+        type_, match = self.DefineType(line_content, state)
+
+        # Update the blocks
+        self.UpdateBlocks(state, depth, i)
+
+        # If the type is defined and (it not have a previous block or the previous block is recursite or the previous block is empty)
+        prev_block_type = state.prev_block_type
+        if type_ is not None and (prev_block_type is None or self.blocks[prev_block_type]['recursive'] is True or not state.IsIn(prev_block_type)):
+
+            self.HandleType(state, depth, type_, match, i)  # Handle the current detected type
+            self.Reinit(state, type_)                       # Reinit the single types
+
+            # Update the previous block type if need
+            if type_ in self.blocks:
+                state.prev_block_type = type_
+
+    def DefineType(self, line_content, state):
+        """
+        Define the type of the current line (block, single, or none) based on the compiled patterns.
+
+        Args:
+            line_content (str): The normalized line to be analyzed.
+            state (ParseState): The parser state, for the blocks the line is in.
+
+        Returns:
+            tuple: The identified type of the line (or None) and the block pattern match (or None for the singles).
+        """
+        # Check the single types that need to be check before the blocks
+        for type_, verify in self.singles_up:
+            if verify(line_content):
+                return type_, None
+
+        # Check the blocks types, if the line don't contain an ignore pattern
+        if self.ignore_pattern is None or self.ignore_pattern.search(line_content) is None:
+            for type_, regex, keyword, is_not_in, is_inside in self.block_rules:
+                if keyword not in line_content:     # Most of the lines can't match most of the patterns, skip them without a search
+                    continue
+                match = regex.search(line_content)
+                # If match and the block is in or not in some blocks
+                if match and all(not state.IsIn(no_type) for no_type in is_not_in) and all(state.IsIn(in_type) for in_type in is_inside):
+                    return type_, match
+
+        # Check the single types that need to be check after the blocks
+        for type_, verify in self.singles_down:
+            if verify(line_content):
+                return type_, None
+
+        # default blocks, not very usefull
+        return self.single_default, None
+
+    def UpdateBlocks(self, state, depth, i):
+        """
+        Update the status of block elements based on the current line and modify their end indexes accordingly.
+        Only the open entries are checked (cf ParseState.live), the most recent first.
+
+        Args:
+            state (ParseState): The parser state, updated in place.
+            depth (BracketDepth or LineDepth): The blocks depth of the file.
+            i (int): The current line index being processed.
+        """
+        in_, live, block_parenthesis = state.in_, state.live, state.block_parenthesis
+        for type_ in self.blocks_key:   # For each block types
+            n = len(in_[type_])         # Get the numner of process blocks
+            if n == 0:
+                continue
+            opened = live[type_][::-1]  # The open entries before the line (starting by the most recent)
+
+            if block_parenthesis[0] is not True and type_ == block_parenthesis[1]:                                     # If arguments are started and not end up (they are the last entry)
+                block_parenthesis[0], idx_e = depth.IsEndUp(i, n=block_parenthesis[0], add='(', remove=')')             # Check if end up at this line or get the new advancement
+                if block_parenthesis[0] is True:                                                                        # If this time it's end up
+                    self.UpdateState(state, depth, idx_e, 0, i, type_, n-1)                                            # Process the rest of the line after this args
+
+            if not opened or depth.IsUnchanged(i, add=self.blocks[type_]['open'], remove=self.blocks[type_]['close']):  # If the line can't change the open blocks, stop there
+                continue
+
+            for j in opened:
+                self.UpdateState(state, depth, 0, in_[type_][j], i, type_, j)
+
+    def UpdateState(self, state, depth, offset, nb_open_close, line_idx, type_, block_idx):
+        """
+        Update the state of a block element based on whether it has reached its end or not.
+
+        Args:
+            state (ParseState): The parser state, updated in place.
+            depth (BracketDepth or LineDepth): The blocks depth of the file.
+            offset (int): The index in the line from which the block end is checked.
+            nb_open_close (int): The current count of open/close indicators for the block (0 when its arguments just end up).
+            line_idx (int): The current line index being processed.
+            type_ (str): The type of the block element being updated.
+            block_idx (int): The index of the block in the current state.
+        """
+        is_endup, _ = depth.IsEndUp(line_idx, nb_open_close, add=self.blocks[type_]['open'], remove=self.blocks[type_]['close'], offset=offset) # Get the new advancement
+        if is_endup is True:                                            # If end up
+            state.in_[type_][block_idx] = 0
+            state.open_[type_][block_idx][2] = line_idx                 # Update the end of its element
+            if nb_open_close > 0:
+                state.live[type_].remove(block_idx)
+            if block_idx == 0:                                          # If it's the oldes block, delete the end up ones
+                if not state.dead[type_]:
+                    state.Drop(type_, Del(state.in_[type_]))
+                state.Trim(type_)
+        else:                                                           # If block not end up update it's advancement
+            state.in_[type_][block_idx] = is_endup
+            if nb_open_close == 0:                                      # Its arguments just end up
+                if is_endup > 0:
+                    state.live[type_].append(block_idx)
+                elif block_idx == 0:
+                    state.Trim(type_)
+
+    def HandleType(self, state, depth, type_, match, i):
+        """
+        Handle the processing of a specific type by updating elements and state based on the line.
+
+        Args:
+            state (ParseState): The parser state, updated in place.
+            depth (BracketDepth or LineDepth): The blocks depth of the file.
+            type_ (str): The type of element being processed.
+            match (re.Match or None): The match of the block pattern on the line (None for the singles).
+            i (int): The current line index being processed.
+        """
+        in_, block_parenthesis = state.in_, state.block_parenthesis
+
+        # If the element is a single line
+        if type_ in self.singles:
+            # If it's the first one, add it
+            if in_[type_] == 0:
+                if state.single is not None:    # The previous single is done
+                    state.done.append(state.single)
+                state.single = [type_, i, i,  None]
+                in_[type_] += 1
+            # If it make more than a line with this type, update the last occurence
+            else:
+                state.single[2] = i
+
+        # If it's a block
+        else:
+            n_parenthesis, idx_e = depth.IsEndUp(i, n=0, add='(', remove=')') # Init the parenthesis
+
+            # If have args, add the args detection
+            if self.blocks[type_]['have_args']:
+                block_parenthesis[0] = n_parenthesis
+            # If not, ignore it
+            else:
+                block_parenthesis[0] = True
+                idx_e = 0
+
+            previous_type = block_parenthesis[1]
+            block_parenthesis[1] = type_
+            open_ = state.open_[type_]
+            element = [type_, i, i, GetName(match)]     # The new block element
+
+            if block_parenthesis[0] is True:        # If no args or args end up
+                # Get the line without the args and update the block state
+                is_endup, idx_e = depth.IsEndUp(i, n=0, add=self.blocks[type_]['open'], remove=self.blocks[type_]['close'], offset=idx_e)
+
+                # If the block is not end up, we add it to the process one
+                if is_endup is not True:
+                    in_[type_].append(is_endup)
+                    open_.append(element)
+                    if is_endup > 0:
+                        state.live[type_].append(len(in_[type_])-1)
+                # If it's already end up, it have no state entry but the entries stay paired with the most recent elements of the type
+                elif open_:
+                    state.done.append(open_.pop(0))
+                    open_.append(element)
+                else:
+                    state.done.append(element)
+
+            # If the args are not end up, current block process is at 0 (but not end up)
+            else:
+                in_[type_].append(0)
+                open_.append(element)
+
+            # The entries that were waiting their args, or that are not open, can't change anymore
+            state.Trim(type_)
+            if previous_type is not None and previous_type != type_:
+                state.Trim(previous_type)
+
+    def Reinit(self, state, type_):
+        """
+        Reinitialize the state of single-line elements, setting their counters to zero except for the current type.
+        The current single element is done once another type is handled.
+
+        Args:
+            state (ParseState): The parser state, updated in place.
+            type_ (str): The type that should not be reset.
+        """
+        for single in self.singles_key:
+            if type_ != single:
+                state.in_[single] = 0
+
+        if state.single is not None and state.single[0] != type_:
+            state.done.append(state.single)
+            state.single = None
+
+class ParseState:
+    """
+    The state of the parser between two lines.
+
+    Args:
+        blocks_key (list of str): The block types.
+        singles_key (list of str): The single types.
+
+    Attributes:
+        in_ (dict): For each block type the count of open/close of each started block (0 = end up or waiting its args),
+                    for each single type 1 if it's the current single, else 0.
+        open_ (dict): For each block type the element (type, start, end, name) of each entry of in_, so a block end
+                      is updated without searching its element.
+        live (dict): For each block type the indexes in in_ of the open entries (count > 0), in order.
+        dead (dict): For each block type the number of end up entries removed from the start of in_ while the first
+                     one was not open (cf Trim). They still count as started blocks (cf IsIn), but nothing can change
+                     them anymore, so their elements are done.
+        single (list or None): The element of the current single, that can still be extended.
+        block_parenthesis (list): Permite to know if we are in arguments lines (in_arguments ?, the type).
+        prev_block_type (str or None): The type of the last handled block.
+        done (list of list): The elements that can't change anymore and are not yet given to the caller.
+    """
+    def __init__(self, blocks_key, singles_key):
+        self.in_ = {key:[] for key in blocks_key}           # For the blocks, we init it with an empty list (each elements = a block start)
+        self.in_.update({key:0 for key in singles_key})     # For the single, a simple integer
+        self.open_ = {key:[] for key in blocks_key}
+        self.live = {key:[] for key in blocks_key}
+        self.dead = {key:0 for key in blocks_key}
+        self.single = None
+        self.block_parenthesis = [True, None]
+        self.prev_block_type = None
+        self.done = []
+
+    def IsIn(self, type_):
+        """
+        Check if blocks of a type are followed, the end up ones not yet deleted included.
+
+        Args:
+            type_ (str): The block type.
+
+        Returns:
+            bool: True if the type has entries.
+        """
+        return len(self.in_[type_]) > 0 or self.dead[type_] > 0
+
+    def Drop(self, type_, count):
+        """
+        Remove the first entries of a block type, their elements are done.
+
+        Args:
+            type_ (str): The block type.
+            count (int): The number of entries.
+        """
+        open_ = self.open_[type_]
+        self.done.extend(open_[:count])
+        del open_[:count]
+        del self.in_[type_][:count]
+        self.live[type_] = [j - count for j in self.live[type_] if j >= count]
+
+    def Trim(self, type_):
+        """
+        Remove the end up entries at the start of a block type, if it's not open (nor waiting its arguments).
+
+        Once the first entry is end up without being deleted (cf Del), the entries are never deleted again: the ones
+        before the first open entry only keep the type started, and an element can only be moved to the entries
+        before it (cf HandleType), so their elements can't change anymore. They are counted in dead instead.
+
+        Args:
+            type_ (str): The block type.
+        """
+        in_ = self.in_[type_]
+        waiting = self.block_parenthesis[0] is not True and self.block_parenthesis[1] == type_     # The last entry waits its arguments
+        count = 0
+        while count < len(in_) and in_[count] == 0 and not (waiting and count == len(in_)-1):
+            count += 1
+        if count:
+            self.dead[type_] += count
+            self.Drop(type_, count)
+
+    def Close(self):
+        """
+        End the input: every element still in the state is done.
+
+        Returns:
+            list of list: The done elements not yet given to the caller followed by the remaining elements, by start.
+        """
+        remaining = [element for open_ in self.open_.values() for element in open_]
+        if self.single is not None:
+            remaining.append(self.single)
+        return self.done + sorted(remaining, key=itemgetter(1))
+
+def CheckRules(blocks, singles, ignore=[]):
+    """
+    Verify that a rule set is well formed before compiling it.
+
+    Args:
+        blocks (dict): The block rules (cf GetElements).
+        singles (dict): The single-line rules (cf GetElements).
+        ignore (list of str): The ignore strings.
+
+    Raises:
+        Exception: If a rule is malformed.
+    """
+    for type_, values in blocks.items():
+        missing = [key for key in BLOCK_KEYS if key not in values]
+        if missing:
+            raise Exception(f'The block {type_} miss the keys {missing}.')
+        if not values['open'] or not values['close']:
+            raise Exception(f'The block {type_} need a non empty open and close.')
+        try:
+            re.compile(values['pattern'])
+        except re.error as e:
+            raise Exception(f'The pattern of the block {type_} is not valid: {e}.')
+        for ref in list(values['is_not_in']) + list(values['is_inside']):
+            if ref not in blocks:
+                raise Exception(f'The block {type_} refer to the unknown block {ref}.')
+
+    for type_, values in singles.items():
+        missing = [key for key in SINGLE_KEYS if key not in values]
+        if missing:
+            raise Exception(f'The single {type_} miss the keys {missing}.')
+        if type_ in blocks:
+            raise Exception(f'The type {type_} is defined as a block and as a single.')
+        if values['position'] not in SINGLE_POSITIONS:
+            raise Exception(f'The position {values["position"]} of the single {type_} is not handle.')
+        if values['position'] in ('up', 'down'):
+            GetVerifier(values['element'], values['way'])   # Raise if the way is not handle
+
+    if any(not isinstance(ign, str) for ign in ignore):
+        raise Exception('The ignore elements need to be str.')
+
+def GetVerifier(element, way):
+    """
+    Resolve a single 'way' to a function verifying if a string matches the element.
+
+    Args:
+        element (str): The element or pattern to match against.
+        way (str): The method of verification ('==', 'startswith', 'endswith', 'in', or 'no x,y,...').
+
+    Returns:
+        callable: A function taking the normalized line and returning True if it matches.
+
+    Raises:
+        Exception: If the way is not handle.
+    """
+    if way == '==':
+        return lambda string: string == element
+    elif way == 'startswith':
+        return lambda string: string.startswith(element)
+    elif way == 'endswith':
+        return lambda string: string.endswith(element)
+    elif way == 'in':
+        return lambda string: string in element
+    elif way.startswith('no '):
+        chars = tuple(way[3:].split(',')[3:])
+        return lambda string: all(char not in string for char in chars)
+    else:
+        raise Exception(f'The way {way} is not handle.')
+
+def GetKeyword(pattern):
+    """
+    Get the longest literal that a pattern requires in any string it matches.
+
+    The literals are the runs of plain chars of the pattern, out of the alternatives, the optional repeats and the
+    case insensitive parts. Inside a group or a repeat of at least once they are required too.
+
+    Args:
+        pattern (str): The regex pattern.
+
+    Returns:
+        str: The longest required literal ('' if there is none, contained in any string).
+    """
+    parsed = sre_parse.parse(pattern)
+    if parsed.state.flags & re.IGNORECASE:
+        return ''
+
+    literals, current = [], []
+
+    def Walk(items):
+        """
+        Add the required literals of parsed items, a run of chars being ended by anything else.
+        """
+        for op, av in items:
+            if op is sre_constants.LITERAL:
+                current.append(chr(av))
+                continue
+            literals.append(''.join(current))
+            current.clear()
+            if op is sre_constants.SUBPATTERN and not av[1] & re.IGNORECASE:                                        # A group: (group, add flags, del flags, items)
+                Walk(av[3])
+            elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT) and av[0] >= 1:                     # A repeat: (min, max, items)
+                Walk(av[2])
+            literals.append(''.join(current))
+            current.clear()
+
+    Walk(parsed)
+    literals.append(''.join(current))
+    return max(literals, key=len)
+
+def IsEndUp(line, n, add='{', remove='}'):
+    """
+    Determine if a line marks the end of a block based on a counter for opening and closing characters.
+
+    Args:
+        line (str): The line to be checked.
+        n (int): The current count of open block indicators.
+        add (str, optional): The character that indicates an opening. Defaults to '{'.
+        remove (str, optional): The character that indicates a closing. Defaults to '}'.
+
+    Returns:
+        tuple: A boolean indicating if the block ends on this line, and the final index examined.
+    """
+    have_change = False                     # Bool to know if a change have occur
+    size_max = max(len(add), len(remove))   # The size_max between the opening and closing
+
+    # Check the line size
+    if len(line)<size_max:
+        return n, len(line)
+
+    i = 0
+    while i < len(line)-(size_max-1):       # While the end of the line is not reached
+        # Get the samples
+        sample_add = line[i: i+len(add)]
+        sample_remove = line[i: i+len(remove)]
+
+        if sample_add == add:   # If add
+            n+=1                # Add one element
+            have_change = True  # have_change is true
+            i+=len(add)-1       # pass the len of the add element
+        elif sample_remove == remove and n-1>=0:
+            n-=1
+            have_change = True
+            i+=len(remove)-1
+
+        # If a change and we are at 0, the end is reach
+        if n == 0 and have_change:
+            return True, i + size_max - 1
+
+        i+=1    # If no end, pass to the next char
+    return n, i # Return the advancement
+
+class LineDepth:
+    """
+    Blocks depth computed by rescanning the line with IsEndUp at each call.
+
+    Args:
+        lines_content (list of str): The normalized lines.
+        first (int, optional): The index of the first line (when the lines are a chunk of the file). Defaults to 0.
+    """
+    def __init__(self, lines_content, first=0):
+        self.lines_content = lines_content
+        self.first = first
+
+    def IsEndUp(self, k, n, add='{', remove='}', offset=0):
+        """
+        Same as IsEndUp on the line k starting at the index offset.
+
+        Args:
+            k (int): The line index.
+            n (int): The current count of open block indicators.
+            add (str, optional): The str that indicates an opening. Defaults to '{'.
+            remove (str, optional): The str that indicates a closing. Defaults to '}'.
+            offset (int, optional): The index in the line where the check start. Defaults to 0.
+
+        Returns:
+            tuple: True if the block ends on this line or the new count, and the index (relative to offset) where it ends.
+        """
+        return IsEndUp(self.lines_content[k - self.first][offset:], n, add=add, remove=remove)
+
+    def IsUnchanged(self, k, add='{', remove='}'):
+        """
+        Check if the line k can't change the count of a block already open at its start.
+
+        Args:
+            k (int): The line index.
+            add (str, optional): The str that indicates an opening. Defaults to '{'.
+            remove (str, optional): The str that indicates a closing. Defaults to '}'.
+
+        Returns:
+            bool: True if the line contains neither the open nor the close.
+        """
+        line = self.lines_content[k - self.first]
+        return add not in line and remove not in line
+
+class BracketDepth(LineDepth):
+    """
+    Blocks depth of a whole file, computed once for each distinct open/close pair with NumPy.
+
+    The normalized lines are joined and, for each pair, the open (+1) / close (-1) deltas are computed over the
+    character codes (in uint8 for an ASCII text), then accumulated. Only the cumulative delta is kept, in int32 (it
+    can't exceed the number of chars), so a pair costs 4 bytes by char. For each line are kept the total delta and
+    the minimum of the running delta, so knowing if a block still open at the start of a line ends on it is a lookup
+    instead of a rescan of the line, and finding where it ends is a search in the precomputed cumulative depth.
+
+    A pair is vectorized when its open and close have the same length (as IsEndUp only check the tokens that fully
+    fit in the line). With multi-characters tokens (like '/*' and '*/') the tokens can overlap and IsEndUp only
+    match the close once something is open, so the vectorized path is only used for a block already open at the
+    start of the line. The other cases fall back to the line rescan.
+
+    Args:
+        lines_content (list of str): The normalized lines.
+        pairs (list of tuple): The (open, close) pairs to follow.
+        first (int, optional): The index of the first line (when the lines are a chunk of the file). Defaults to 0.
+    """
+    def __init__(self, lines_content, pairs, first=0):
+        super().__init__(lines_content, first)
+        self.pairs = {}     # (open, close) -> (cumulative delta, line total, line minimum)
+
+        if not lines_content:
+            return
+
+        # Join the lines with a separator that can't be part of a token, so each line keep at least one char
+        text = '\n'.join(lines_content) + '\n'
+        lengths = np.fromiter((len(line)+1 for line in lines_content), dtype=np.int64, count=len(lines_content))
+        ends = np.cumsum(lengths) - 1   # Index of the separator of each line
+        self.starts = (ends - lengths + 1).tolist()
+        self.ends = ends.tolist()
+        starts = ends - lengths + 1
+
+        codes = None
+        for add, remove in pairs:
+            if len(add) != len(remove) or '\n' in add + remove:    # Not vectorizable, always rescan
+                continue
+
+            if len(add) == 1:   # Single char tokens, compared on the codes of the whole text
+                if codes is None:
+                    codes = (np.frombuffer(text.encode('ascii'), dtype=np.uint8) if text.isascii()
+                             else np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32))
+                delta = (codes == ord(add)).view(np.int8)
+                if remove != add:
+                    delta = delta - (codes == ord(remove)).view(np.int8)
+            else:               # Multi chars tokens, same left to right tokenization than IsEndUp (open first)
+                delta = np.zeros(len(text), dtype=np.int8)
+                for match in re.finditer(re.escape(add) + '|' + re.escape(remove), text):
+                    delta[match.start()] = 1 if match.group() == add else -1
+
+            cumulative = np.cumsum(delta, dtype=np.int32)
+            del delta
+            base = np.where(starts > 0, cumulative[starts - 1], 0)  # Cumulative delta before each line
+            self.pairs[(add, remove)] = (cumulative, (cumulative[ends] - base).tolist(), (np.minimum.reduceat(cumulative, starts) - base).tolist())
+
+    def IsUnchanged(self, k, add='{', remove='}'):
+        """
+        Check if the line k can't change the count of a block already open at its start.
+
+        Args:
+            k (int): The line index.
+            add (str, optional): The str that indicates an opening. Defaults to '{'.
+            remove (str, optional): The str that indicates a closing. Defaults to '}'.
+
+        Returns:
+            bool: True if the line don't change the count (no token, or balanced and never under the start).
+        """
+        pair = self.pairs.get((add, remove))
+        if pair is None:
+            return super().IsUnchanged(k, add=add, remove=remove)
+        return pair[1][k - self.first] == 0 and pair[2][k - self.first] == 0
+
+    def IsEndUp(self, k, n, add='{', remove='}', offset=0):
+        """
+        Same as IsEndUp on the line k starting at the index offset.
+        The index is the one of IsEndUp when the block ends, the length of the checked line otherwise.
+
+        Args:
+            k (int): The line index.
+            n (int): The current count of open block indicators.
+            add (str, optional): The str that indicates an opening. Defaults to '{'.
+            remove (str, optional): The str that indicates a closing. Defaults to '}'.
+            offset (int, optional): The index in the line where the check start. Defaults to 0.
+
+        Returns:
+            tuple: True if the block ends on this line or the new count, and the index (relative to offset) where it ends.
+        """
+        pair = self.pairs.get((add, remove))
+        size = len(add)
+
+        # Not vectorized pair, or multi chars tokens not already open at the start of the line
+        if pair is None or (size > 1 and (n == 0 or offset != 0)):
+            return super().IsEndUp(k, n, add=add, remove=remove, offset=offset)
+
+        cumulative, total, minimum = pair
+        idx = k - self.first
+        start, end = self.starts[idx] + offset, self.ends[idx]
+
+        length = end - start    # Length of the checked line
+
+        if offset == 0 and n > 0 and n + minimum[idx] > 0: # Never go back to 0 on this line
+            return n + total[idx], length
+
+        if length < SCALAR_LENGTH:  # Short line, a rescan cost less than a NumPy search
+            return super().IsEndUp(k, n, add=add, remove=remove, offset=offset)
+
+        if n == 0:  # Nothing open, the closes are ignored until the first open (a single char here)
+            found = self.lines_content[idx].find(add, offset)
+            if found < 0:
+                return 0, length
+            start += found - offset
+
+        # Search where the cumulative delta go back to the level of the block start
+        target = (int(cumulative[start-1]) if start else 0) - n
+        ended = cumulative[start:end] <= target
+        first_ended = int(ended.argmax())   # The first one, without the array of all their indexes
+        if not ended[first_ended]:
+            return int(cumulative[end]) - target, length
+        return True, start + first_ended - (end - length) + 2*(size-1)
+
+def Del(list_):
+    """
+    Get the number of already end up entries to delete at the start of a block state list.
+
+    Args:
+        list_ (list of int): A list representing block counts, its first entry being end up.
+
+    Returns:
+        int: The number of entries before the most recent block in process (at least the first one).
+    """
+    last = 1
+    # Get the index of the most recent block in process (>0), the ones before are deleted
+    for idx in range(len(list_)-1, 0, -1):
+        if list_[idx]>0:
+            last = idx
+            break
+    return last
+
+def GetName(match):
+    """
+    Extract the name or identifier of a block element from the match of its defined pattern.
+
+    Args:
+        match (re.Match): The match of the block pattern on the line.
+
+    Returns:
+        str or None: The extracted name ('' if the pattern don't capture one) or None if no match.
+    """
+    if match:
+        name = match.group(1) if match.re.groups > 0 else None
+        return name if name is not None else ''
+    else:
+        return None
+
+def DisplayElements(elements):
+    """
+    Print each element from the list of identified elements.
+
+    Args:
+        elements (list of list)
+
+    Returns:
+        None: This function does not return any value. It prints the elements to the standard output.
+    """
+    for element in elements:
+        print(element)
+
+def GetNormalizedLine(line):
+    """
+    Normalize a line by removing quoted substrings and extra whitespace.
+
+    Args:
+        line (str): The line of text to be normalized.
+
+    Returns:
+        str: The normalized line with quoted substrings removed and whitespace reduced to single spaces.
+    """
+    normalized_line = re.sub(r"'[^']*'|\"[^\"]*\"", "", line)
+
+    normalized_line = ' '.join(normalized_line.split()).strip()
+
     return normalized_line
\ No newline at end of file
@@ -0,0 +1,314 @@
+from bisect import bisect_left
+from operator import itemgetter
+
+from jsCodeStructureIncremental import Analysis, CHECKPOINT_LINES
+
+HISTORY_CHECKPOINT_LINES = 8    # Lines between two checkpoints of a History, the versions being processed again from the one before the edit
+
+def DiffElements(old_lines, new_lines, detector, types=None):
+    """
+    Get the structural diff between two versions of a file: the added, removed, moved and modified elements.
+
+    Only the old version is processed entirely, the new one is processed from the end of the lines they have in
+    common at their start, until it gets back the parser state of the old one (cf Analysis). To diff a whole
+    history, use a History so each version is only processed where it changed.
+
+    Args:
+        old_lines (list of str): The lines of the old version.
+        new_lines (list of str): The lines of the new version.
+        detector (Detector): The compiled rules.
+        types (iterable of str, optional): The types of elements reported. Defaults to all of them.
+
+    Returns:
+        Diff: The changed elements.
+    """
+    return History(detector, old_lines, types, CHECKPOINT_LINES).Diff(new_lines)   # Only one edit, fewer checkpoints
+
+class History:
+    """
+    Structural diffs between the successive versions of a file.
+
+    The elements of the current version are kept in an Analysis, so a new version is only processed from the end of
+    the lines it has in common at its start with the current one, until the parser state is back to the previous one
+    (the lines they have in common at their end are not processed again). Each element is identified by its type,
+    its name and a hash of its lines (with the whitespace reduced, the strings kept), the hashes of the lines in
+    common being kept too. Only the elements overlapping the edited lines are hashed, the others keep their identity,
+    shifted by the number of added lines. When the edited lines are a block moved, only the block is processed again,
+    as its removal then its insertion. The elements with the same identity are matched whatever their lines, in
+    linear time.
+
+    Args:
+        detector (Detector): The compiled rules.
+        lines (list of str): The lines of the first version.
+        types (iterable of str, optional): The types of elements reported. Defaults to all of them.
+        checkpoint_every (int, optional): The number of lines between two checkpoints of the Analysis. Defaults to
+                                          HISTORY_CHECKPOINT_LINES.
+
+    Attributes:
+        lines (list of str): The lines of the current version.
+        analysis (Analysis): Its elements, updated to each new version.
+        elements (list of list): A copy of its elements, as they are reported.
+        keys (list of tuple): The identity (type, name, content hash) of each element.
+    """
+    def __init__(self, detector, lines, types=None, checkpoint_every=HISTORY_CHECKPOINT_LINES):
+        self.types = None if types is None else set(types)
+        self.lines = list(lines)
+        self.analysis = Analysis(detector, self.lines, checkpoint_every)
+        self.line_hashes = [GetLineHash(line) for line in self.lines]
+        self.elements, self.keys = self.GetKeys()
+
+    def Diff(self, new_lines):
+        """
+        Get the structural diff between the current version and a new one, which becomes the current one.
+
+        Args:
+            new_lines (list of str): The lines of the new version.
+
+        Returns:
+            Diff: The changed elements.
+        """
+        new_lines = list(new_lines)
+        old_lines = self.lines
+
+        # The lines in common at the start and at the end
+        size = min(len(old_lines), len(new_lines))
+        prefix = GetCommon(old_lines, new_lines, size)
+        suffix = GetCommon(old_lines[::-1], new_lines[::-1], size - prefix)
+        if prefix == len(old_lines) == len(new_lines):
+            return Diff([], [], [], [])
+
+        old_end, new_end = len(old_lines) - suffix, len(new_lines) - suffix
+        moved = GetMove(old_lines[prefix:old_end], new_lines[prefix:new_end])
+        if moved is None:
+            edits = [(prefix, old_end, new_lines[prefix:new_end])]
+        elif moved > 0:     # The lines between moved up: the first ones removed, the last ones inserted
+            edits = [(prefix, prefix + moved, []), (new_end - moved, new_end - moved, new_lines[new_end-moved:new_end])]
+        else:               # The lines between moved down: the last ones removed, the first ones inserted
+            edits = [(old_end + moved, old_end, []), (prefix, prefix, new_lines[prefix:prefix-moved])]
+        for start, end, lines in edits:
+            self.analysis.Update(start, end, lines)
+            self.line_hashes[start:end] = [GetLineHash(line) for line in lines]
+        self.lines = new_lines
+
+        old_elements, old_keys = self.elements, self.keys
+        self.elements, self.keys = self.GetKeys((prefix, old_end, new_end))
+        return Match(old_elements, old_keys, self.elements, self.keys)
+
+    def GetKeys(self, edit=None):
+        """
+        Copy the elements of the current version, and get their identity.
+
+        After an edit, the elements out of the edited lines are the ones of the previous version (shifted by the number
+        of added lines after them), so they keep their copy and their identity: only the others are hashed.
+
+        Args:
+            edit (tuple, optional): The first edited line, and the end of the edited lines in the previous version and
+                                    in the current one. Defaults to None, for the first version.
+
+        Returns:
+            tuple: The elements (list of list) and their identity (list of tuple: type, name, content hash).
+        """
+        line_hashes = self.line_hashes
+        elements = [element for element in self.analysis.elements if self.types is None or element[0] in self.types]
+        copies, keys = [None] * len(elements), [None] * len(elements)
+        changed = range(len(elements))
+
+        if edit is not None:
+            prefix, old_end, new_end = edit
+            delta = new_end - old_end
+            old_elements, old_keys = self.elements, self.keys
+
+            # The elements started before the edit are the same ones, they are unchanged if they end before it
+            head = bisect_left(elements, prefix, key=itemgetter(1))
+            copies[:head], keys[:head] = old_elements[:head], old_keys[:head]
+
+            # The elements started after the edit are unchanged if they are the old ones shifted
+            tail = min(len(elements) - bisect_left(elements, new_end, key=itemgetter(1)),
+                       len(old_elements) - bisect_left(old_elements, old_end, key=itemgetter(1)),
+                       len(elements) - head)
+            if tail:
+                keys[-tail:] = old_keys[-tail:]
+                copies[-tail:] = [[type_, start + delta, end + delta, name] for type_, start, end, name in old_elements[-tail:]] if delta else old_elements[-tail:]
+
+            changed = ([k for k in range(head) if elements[k][2] >= prefix or elements[k] != copies[k]]
+                       + list(range(head, len(elements) - tail))
+                       + [k for k in range(len(elements) - tail, len(elements)) if elements[k] != copies[k]])
+
+        for k in changed:
+            type_, start, end, name = copies[k] = list(elements[k])
+            keys[k] = (type_, name, hash(tuple(line_hashes[start:end+1])))
+        return copies, keys
+
+class Diff:
+    """
+    The changed elements between two versions of a file.
+
+    Args:
+        added (list of list): The elements of the new version that are not in the old one.
+        removed (list of list): The elements of the old version that are not in the new one.
+        moved (list of tuple): The (old, new) elements with the same content, but not in the same order among the unchanged ones.
+        modified (list of tuple): The (old, new) elements with the same type and name, but not the same content.
+    """
+    def __init__(self, added, removed, moved, modified):
+        self.added = added
+        self.removed = removed
+        self.moved = moved
+        self.modified = modified
+
+    def GetChanges(self):
+        """
+        Get each change with the type and the name of its element, by line of the new version (the removed ones last).
+
+        Returns:
+            list of tuple: The type, the name and the change ('added', 'removed', 'moved' or 'modified').
+        """
+        changes = [(element[1], element[0], element[3], 'added') for element in self.added]
+        changes += [(new[1], new[0], new[3], change) for change, pairs in (('moved', self.moved), ('modified', self.modified)) for _, new in pairs]
+        changes.sort(key=lambda change: change[0])
+        changes += [(None, element[0], element[3], 'removed') for element in self.removed]
+        return [change[1:] for change in changes]
+
+    def Report(self):
+        """
+        Format the changes, one by line (as 'methods addVictory modified').
+
+        Returns:
+            str: The report.
+        """
+        return '\n'.join(' '.join(part for part in change if part) for change in self.GetChanges())
+
+    def __len__(self):
+        return len(self.added) + len(self.removed) + len(self.moved) + len(self.modified)
+
+    def __repr__(self):
+        return f'Diff({len(self.added)} added, {len(self.removed)} removed, {len(self.moved)} moved, {len(self.modified)} modified)'
+
+def Match(old_elements, old_keys, new_elements, new_keys):
+    """
+    Match the elements of two versions by identity, then the remaining ones by type and name.
+
+    Args:
+        old_elements (list of list): The elements of the old version, by start.
+        old_keys (list of tuple): Their identity.
+        new_elements (list of list): The elements of the new version, by start.
+        new_keys (list of tuple): Their identity.
+
+    Returns:
+        Diff: The changed elements.
+    """
+    # The elements in common at the start and at the end are unchanged, only the ones between them are matched
+    size = min(len(old_keys), len(new_keys))
+    first = GetCommon(old_keys, new_keys, size)
+    last = GetCommon(old_keys[::-1], new_keys[::-1], size - first)
+
+    # The old elements of each identity, the first one at the end to be matched first
+    olds = {}
+    for k in range(len(old_keys)-1-last, first-1, -1):
+        olds.setdefault(old_keys[k], []).append(k)
+
+    pairs, unmatched = [], []
+    for j in range(first, len(new_keys) - last):
+        key = new_keys[j]
+        same = olds.get(key)
+        if same:
+            pairs.append((same.pop(), j))
+        else:
+            unmatched.append(j)
+
+    # The remaining elements with the same type and name are modified
+    remaining = sorted(k for same in olds.values() for k in same)
+    names = {}
+    for k in reversed(remaining):
+        names.setdefault(old_keys[k][:2], []).append(k)
+    added, modified = [], []
+    for j in unmatched:
+        same = names.get(new_keys[j][:2])
+        if same:
+            modified.append((old_elements[same.pop()], new_elements[j]))
+        else:
+            added.append(new_elements[j])
+    removed = [old_elements[k] for k in sorted(k for same in names.values() for k in same)]
+
+    # The unchanged elements out of their longest common order are moved
+    kept = GetIncreasing([k for k, _ in pairs])
+    moved = [(old_elements[k], new_elements[j]) for p, (k, j) in enumerate(pairs) if p not in kept]
+
+    return Diff(added, removed, moved, modified)
+
+def GetMove(old, new):
+    """
+    Check if the edited lines are a block moved: most of the old lines are shifted by a few lines, so they don't need
+    to be processed again, only the few ones removed at one end and inserted at the other.
+
+    Args:
+        old (list of str): The old lines.
+        new (list of str): The new lines.
+
+    Returns:
+        int or None: The number of lines removed at the start and inserted at the end (positive), or removed at the end
+                     and inserted at the start (negative), the fewest possible. None if the lines are not shifted.
+    """
+    size = len(old)
+    if size != len(new):
+        return None
+    for moved in range(1, size):
+        if old[moved] == new[0] and old[moved:] == new[:size-moved]:
+            return moved
+        if old[0] == new[moved] and old[:size-moved] == new[moved:]:
+            return -moved
+    return None
+
+def GetCommon(old, new, size):
+    """
+    Get the length of the common start of two lists.
+
+    Args:
+        old (list): The first list.
+        new (list): The second list.
+        size (int): The maximum length.
+
+    Returns:
+        int: The number of equal items at their start, at most size.
+    """
+    return next((k for k, (old_item, new_item) in enumerate(zip(old, new)) if k == size or old_item != new_item), size)
+
+def GetIncreasing(values):
+    """
+    Get a longest increasing subsequence of values (patience sorting).
+
+    Args:
+        values (list of int): The values.
+
+    Returns:
+        set of int: The indexes of the values in the subsequence.
+    """
+    tails, tails_idx = [], []           # The smallest last value of an increasing subsequence of each length, and its index
+    previous = [None] * len(values)     # The index of the value before each one in its subsequence
+    for idx, value in enumerate(values):
+        length = bisect_left(tails, value)
+        previous[idx] = tails_idx[length-1] if length else None
+        if length == len(tails):
+            tails.append(value)
+            tails_idx.append(idx)
+        else:
+            tails[length] = value
+            tails_idx[length] = idx
+
+    kept = set()
+    idx = tails_idx[-1] if tails_idx else None
+    while idx is not None:
+        kept.add(idx)
+        idx = previous[idx]
+    return kept
+
+def GetLineHash(line):
+    """
+    Hash a line with its whitespace reduced, so a change of indentation don't modify its elements.
+
+    Args:
+        line (str): The line.
+
+    Returns:
+        int: The hash.
+    """
+    return hash(' '.join(line.split()))
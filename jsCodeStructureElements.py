@@ -0,0 +1,212 @@
+import json
+import mmap
+import struct
+from array import array
+import numpy as np
+
+ELEMENTS_MAGIC = b'JSCE'                # Start of an elements file
+ELEMENTS_VERSION = 1                    # Version of the elements file format
+HEADER = struct.Struct('<4sIQQQQ')      # Magic, version, number of elements, size of the types table, number of names, size of the names
+ALIGN = 8                               # Alignment of the sections of an elements file, so they can be mapped as arrays
+
+class Elements:
+    """
+    Compact elements: a struct of arrays instead of a list of [type, start, end, name] lists.
+
+    The types and the names are interned in tables, and each element is only a type code, a start, an end and a name
+    code (-1 for None) in NumPy arrays. Indexing and iterating give the [type, start, end, name] lists of GetElements.
+    Saved to a file, the arrays can be mapped and queried without loading the file.
+
+    Args:
+        types (list of str): The types table.
+        names (sequence of str): The names table.
+        type_codes (np.ndarray): The type code of each element (uint16).
+        starts (np.ndarray): The start line of each element (int32).
+        ends (np.ndarray): The end line of each element (int32).
+        name_codes (np.ndarray): The name code of each element, -1 for None (int32).
+    """
+    def __init__(self, types, names, type_codes, starts, ends, name_codes):
+        self.types = types
+        self.names = names
+        self.type_codes = type_codes
+        self.starts = starts
+        self.ends = ends
+        self.name_codes = name_codes
+
+    @classmethod
+    def FromElements(cls, elements, types=(), sort=False):
+        """
+        Build compact elements from [type, start, end, name] elements, without keeping them.
+
+        Args:
+            elements (iterable of list): The elements.
+            types (iterable of str, optional): The first types of the table, to have the same codes for several results. Defaults to none.
+            sort (bool, optional): Sort the elements by start, as GetElements. Defaults to False.
+
+        Returns:
+            Elements: The compact elements.
+        """
+        types = {type_:code for code, type_ in enumerate(types)}
+        names = {}
+        type_codes, starts, ends, name_codes = array('H'), array('i'), array('i'), array('i')
+        for type_, start, end, name in elements:
+            type_codes.append(types.setdefault(type_, len(types)))
+            starts.append(start)
+            ends.append(end)
+            name_codes.append(-1 if name is None else names.setdefault(name, len(names)))
+
+        result = cls(list(types), list(names), np.frombuffer(type_codes, dtype=np.uint16), np.frombuffer(starts, dtype=np.int32),
+                     np.frombuffer(ends, dtype=np.int32), np.frombuffer(name_codes, dtype=np.int32))
+        if sort and len(result) and np.any(result.starts[1:] < result.starts[:-1]):
+            result = result.Take(np.argsort(result.starts, kind='stable'))
+        return result
+
+    def Take(self, indexes):
+        """
+        Get some of the elements, sharing the tables.
+
+        Args:
+            indexes (slice or np.ndarray): The elements to keep.
+
+        Returns:
+            Elements: The selected elements.
+        """
+        return Elements(self.types, self.names, self.type_codes[indexes], self.starts[indexes], self.ends[indexes], self.name_codes[indexes])
+
+    def GetRange(self, first, last):
+        """
+        Get the elements starting in a range of lines, with a binary search (the elements are sorted by start).
+
+        Args:
+            first (int): The first line.
+            last (int): The line after the last one.
+
+        Returns:
+            Elements: The elements starting in [first, last), sharing the arrays.
+        """
+        return self.Take(slice(np.searchsorted(self.starts, first), np.searchsorted(self.starts, last)))
+
+    def ToList(self):
+        """
+        Get the elements as GetElements gives them.
+
+        Returns:
+            list of list: The elements (type, start, end, name).
+        """
+        return list(self)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.Take(index)
+        name = int(self.name_codes[index])
+        return [self.types[self.type_codes[index]], int(self.starts[index]), int(self.ends[index]), None if name < 0 else self.names[name]]
+
+    def __iter__(self):
+        types, names = self.types, self.names
+        for type_, start, end, name in zip(self.type_codes.tolist(), self.starts.tolist(), self.ends.tolist(), self.name_codes.tolist()):
+            yield [types[type_], start, end, None if name < 0 else names[name]]
+
+    def __eq__(self, other):
+        if isinstance(other, (Elements, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f'Elements({len(self)} elements, {len(self.types)} types, {len(self.names)} names)'
+
+    def Save(self, path):
+        """
+        Write the elements to a binary file that Load can map.
+
+        The file is a header, the types table (JSON), then each array in little endian and aligned: the type codes,
+        the starts, the ends, the name codes, the offsets of the names (int64) and the names (UTF-8).
+
+        Args:
+            path (str): The file path.
+        """
+        encoded = [name.encode('utf-8', 'surrogatepass') for name in self.names]
+        offsets = np.zeros(len(encoded) + 1, dtype='<i8')
+        offsets[1:] = np.cumsum([len(name) for name in encoded])
+        types = json.dumps(self.types).encode()
+
+        with open(path, 'wb') as file:
+            file.write(HEADER.pack(ELEMENTS_MAGIC, ELEMENTS_VERSION, len(self), len(types), len(encoded), int(offsets[-1])))
+            for section in (types, self.type_codes.astype('<u2').tobytes(), self.starts.astype('<i4').tobytes(),
+                            self.ends.astype('<i4').tobytes(), self.name_codes.astype('<i4').tobytes(), offsets.tobytes(), b''.join(encoded)):
+                file.write(Pad(file.tell()))
+                file.write(section)
+
+    @classmethod
+    def Load(cls, path, mapped=True):
+        """
+        Read elements written by Save.
+
+        Args:
+            path (str): The file path.
+            mapped (bool, optional): Map the file instead of reading it: the arrays are read from the disk as they are
+                                     accessed, and the names are decoded one by one. Defaults to True.
+
+        Returns:
+            Elements: The elements.
+
+        Raises:
+            Exception: If the file is not an elements file of this version.
+        """
+        with open(path, 'rb') as file:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if mapped else file.read()
+
+        if len(data) < HEADER.size:
+            raise Exception(f'The file {path} is not an elements file.')
+        magic, version, count, types_size, names_count, names_size = HEADER.unpack_from(data)
+        if magic != ELEMENTS_MAGIC or version != ELEMENTS_VERSION:
+            raise Exception(f'The file {path} is not an elements file of version {ELEMENTS_VERSION}.')
+
+        view = memoryview(data)     # Sliced without copy
+        offset = HEADER.size
+        sections = []
+        for dtype, size in ((None, types_size), ('<u2', count), ('<i4', count), ('<i4', count), ('<i4', count), ('<i8', names_count + 1), (None, names_size)):
+            offset += len(Pad(offset))
+            if dtype is None:
+                sections.append(view[offset:offset + size])
+                offset += size
+            else:
+                sections.append(np.frombuffer(data, dtype=dtype, count=size, offset=offset))
+                offset += size * np.dtype(dtype).itemsize
+
+        types, type_codes, starts, ends, name_codes, offsets, names = sections
+        return cls(json.loads(bytes(types)), NameTable(offsets, names), type_codes, starts, ends, name_codes)
+
+class NameTable:
+    """
+    Names of a saved file, decoded one by one when they are accessed.
+
+    Args:
+        offsets (np.ndarray): The start of each name in the data, and the end of the last one.
+        data (memoryview): The UTF-8 names.
+    """
+    def __init__(self, offsets, data):
+        self.offsets = offsets
+        self.data = data
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        return str(self.data[self.offsets[index]:self.offsets[index+1]], 'utf-8', 'surrogatepass')
+
+def Pad(offset):
+    """
+    Get the padding that aligns an offset on ALIGN bytes.
+
+    Args:
+        offset (int): The offset.
+
+    Returns:
+        bytes: The padding.
+    """
+    return b'\0' * (-offset % ALIGN)
@@ -0,0 +1,140 @@
+import codecs
+import io
+import mmap
+import os
+import re
+import string
+from itertools import islice
+
+from jsCodeStructureDetection import GetNormalizedLine, CHUNK_LINES
+
+CHUNK_BYTES = 1 << 17           # Size of the mapped file normalized at once (up to the end of its last line)
+FALLBACK_ENCODING = 'latin-1'   # Encoding of the files without BOM that are not valid UTF-8
+BOMS = (                        # The byte order marks and their encoding, the UTF-32 ones first as they start as the UTF-16 ones
+    (codecs.BOM_UTF32_LE, 'utf-32-le'),
+    (codecs.BOM_UTF32_BE, 'utf-32-be'),
+    (codecs.BOM_UTF8, 'utf-8'),
+    (codecs.BOM_UTF16_LE, 'utf-16-le'),
+    (codecs.BOM_UTF16_BE, 'utf-16-be'),
+)
+QUOTES_BYTES = re.compile(rb"'[^'\n]*'|\"[^\"\n]*\"")       # The quoted strings of GetNormalizedLine, a line at a time
+SPACES_BYTES = bytes.maketrans(b'\x1c\x1d\x1e\x1f', b'    ')  # The ASCII whitespace of str.split that bytes.split don't know
+
+def GetElementsFromPath(path, detector, encoding=None, compact=False, tree=False):
+    """
+    Get the elements of a file without reading it in a list of lines.
+
+    The file is mapped in memory and processed by chunks of about CHUNK_BYTES, cut at the end of a line. When the
+    encoding is ASCII compatible, an ASCII chunk is normalized on its bytes (the quoted strings removed and the
+    whitespace reduced with the same rules as GetNormalizedLine, on the whole chunk) and only the normalized text is
+    decoded. The other chunks are decoded and normalized line by line. The processed pages are released, so the
+    memory stays bounded by the chunk and the elements.
+
+    The lines are split as open() does (on '\n', '\r\n' and '\r'), so the elements are the ones of GetElements on
+    the readlines of the file with the same encoding.
+
+    Args:
+        path (str): The file path.
+        detector (Detector): The compiled rules.
+        encoding (str, optional): The encoding of the file. Defaults to the one of its BOM (which is skipped), else
+                                  UTF-8 if it's valid, else FALLBACK_ENCODING.
+        compact (bool, optional): Return an Elements instead of a list of lists. Defaults to False.
+        tree (bool, optional): Return a Tree instead of a list of lists. Defaults to False.
+
+    Returns:
+        list of list, Elements or Tree: The identified elements (cf GetElements).
+    """
+    with open(path, 'rb') as file:
+        size = os.fstat(file.fileno()).st_size
+        data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        try:
+            if encoding is not None:
+                return detector.CollectElements(detector.IterNormalizedElements(IterChunks(data, encoding)), compact, tree)
+
+            encoding, start = DetectEncoding(data)
+            try:
+                return detector.CollectElements(detector.IterNormalizedElements(IterChunks(data, encoding, start)), compact, tree)
+            except UnicodeDecodeError:
+                if start:   # The BOM gives the encoding, the file is invalid
+                    raise
+            return detector.CollectElements(detector.IterNormalizedElements(IterChunks(data, FALLBACK_ENCODING)), compact, tree)
+        finally:
+            if size:
+                data.close()
+
+def DetectEncoding(data):
+    """
+    Get the encoding of a file from its BOM.
+
+    Args:
+        data (bytes or mmap.mmap): The content of the file.
+
+    Returns:
+        tuple: The encoding ('utf-8' without BOM) and the length of the BOM.
+    """
+    head = data[:4]
+    for bom, encoding in BOMS:
+        if head.startswith(bom):
+            return encoding, len(bom)
+    return 'utf-8', 0
+
+def IsAsciiCompatible(encoding):
+    """
+    Check if an encoding keeps the ASCII chars as their single byte, so they can be processed without decoding.
+
+    Args:
+        encoding (str): The encoding.
+
+    Returns:
+        bool: True if the encoding is ASCII compatible.
+    """
+    return string.printable.encode(encoding) == string.printable.encode('ascii')
+
+def IterChunks(data, encoding, start=0):
+    """
+    Split the content of a file in chunks of normalized lines (cf GetNormalizedLine).
+
+    Args:
+        data (bytes or mmap.mmap): The content of the file.
+        encoding (str): Its encoding.
+        start (int, optional): The offset of the first line (after the BOM). Defaults to 0.
+
+    Yields:
+        list of str: The normalized lines of each chunk.
+
+    Raises:
+        UnicodeDecodeError: If the content is not valid in the encoding.
+    """
+    # The newlines of the other encodings are not a single b'\n', decode the whole file
+    if not IsAsciiCompatible(encoding):
+        lines = io.StringIO(codecs.decode(data[start:], encoding), newline=None)
+        yield from iter(lambda: [GetNormalizedLine(line) for line in islice(lines, CHUNK_LINES)], [])
+        return
+
+    release = getattr(mmap, 'MADV_DONTNEED', None) if isinstance(data, mmap.mmap) else None
+    released = 0
+    size = len(data)
+    while start < size:
+        end = data.find(b'\n', start + CHUNK_BYTES)
+        end = size if end == -1 else end + 1
+        chunk = data[start:end]
+        last_ended = chunk.endswith((b'\n', b'\r'))  # No line after the last newline
+
+        if chunk.isascii():
+            # The lines as open() gives them, then normalized on the bytes: the quoted strings can't reach the
+            # end of the line, and bytes.split know the ASCII whitespace of str.split once \x1c-\x1f translated
+            chunk = QUOTES_BYTES.sub(b'', chunk.replace(b'\r\n', b'\n').replace(b'\r', b'\n').translate(SPACES_BYTES))
+            lines_content = b'\n'.join(b' '.join(line.split()) for line in chunk.split(b'\n')).decode('ascii').split('\n')
+        else:
+            text = chunk.decode(encoding).replace('\r\n', '\n').replace('\r', '\n')
+            lines_content = [GetNormalizedLine(line) for line in text.split('\n')]
+        if last_ended:
+            lines_content.pop()
+        yield lines_content
+
+        # Release the pages of the processed chunks
+        start = end
+        if release is not None and start - released >= CHUNK_BYTES:
+            page_end = start - start % mmap.PAGESIZE
+            data.madvise(release, released, page_end - released)
+            released = page_end
@@ -0,0 +1,330 @@
+from bisect import bisect_left, bisect_right
+from operator import attrgetter, itemgetter
+
+from jsCodeStructureDetection import ParseState, GetNormalizedLine, CHUNK_LINES
+
+CHECKPOINT_LINES = 32   # Number of lines between two saved parser states
+
+class Analysis:
+    """
+    Elements of a file kept up to date after edits, without processing the whole file again.
+
+    The parser state is saved every checkpoint_every lines. After an edit, the processing restarts from the last
+    checkpoint before the edit, and stops as soon as the parser state is the same as the one of the previous run at
+    one of its checkpoints after the edit: the rest of the previous result is then kept, shifted by the number of
+    added lines. The elements are always the same as GetElements on the edited lines.
+
+    The shift of the kept elements is lazy: the ones before an index have their lines, the next ones need the pending
+    shift added. An edit only moves this index over the elements between it and the edit, and reading the elements
+    applies the pending shift, so the edits of a region don't cost the rest of the file. The checkpoints keep the
+    ends of their open elements relative to their line, so they are shifted by only updating their line.
+
+    Args:
+        detector (Detector): The compiled rules.
+        lines (list of str): The lines of the file.
+        checkpoint_every (int, optional): The number of lines between two checkpoints. Defaults to CHECKPOINT_LINES.
+
+    Attributes:
+        elements (list of list): The identified elements (type, start, end, name), in start order. They are updated in
+                                 place, reading them applies the pending shift.
+        lines_content (list of str): The normalized lines.
+        checkpoints (list of Checkpoint): The saved parser states, by line.
+        stored (list of list): The elements, the lines of the ones from shifted on not yet shifted.
+        shifted (int): The index of the first element whose lines need the pending shift.
+        shift (int): The pending shift, in lines.
+    """
+    def __init__(self, detector, lines, checkpoint_every=CHECKPOINT_LINES):
+        self.detector = detector
+        self.checkpoint_every = checkpoint_every
+        self.lines_content = [GetNormalizedLine(line) for line in lines]
+
+        state = ParseState(detector.blocks_key, detector.singles_key)
+        self.checkpoints, done, _ = self.Parse(state, 0, [])
+        self.stored = sorted(done, key=itemgetter(1))
+        self.shifted = len(self.stored)
+        self.shift = 0
+
+    @property
+    def elements(self):
+        """
+        The identified elements, the pending shift applied.
+        """
+        self.ShiftElements(len(self.stored))
+        return self.stored
+
+    def ShiftElements(self, index):
+        """
+        Move the index of the first element whose lines need the pending shift, shifting the elements in between.
+
+        Args:
+            index (int): The new index.
+        """
+        if self.shift:
+            shift = self.shift if index > self.shifted else -self.shift
+            for element in self.stored[min(index, self.shifted):max(index, self.shifted)]:
+                element[1] += shift
+                element[2] += shift
+        self.shifted = index
+
+    def FindElement(self, line):
+        """
+        Get the index of the first element starting at or after a line.
+
+        Args:
+            line (int): The line.
+
+        Returns:
+            int: The index in stored.
+        """
+        idx = bisect_left(self.stored, line, 0, self.shifted, key=itemgetter(1))
+        if idx == self.shifted:
+            idx = bisect_left(self.stored, line - self.shift, self.shifted, len(self.stored), key=itemgetter(1))
+        return idx
+
+    def Update(self, start, end, new_lines):
+        """
+        Replace the lines [start, end) by new lines and update the elements.
+
+        Args:
+            start (int): The first edited line.
+            end (int): The line after the last edited line (start for an insertion).
+            new_lines (list of str): The lines that replace them (empty for a deletion).
+
+        Returns:
+            list of list: The elements found again from the checkpoint before the edit, by start. The others are kept
+                          (cf elements).
+
+        Raises:
+            Exception: If the edited range is not in the file.
+        """
+        if not 0 <= start <= end <= len(self.lines_content):
+            raise Exception(f'The edited lines [{start}, {end}) are not in the file of {len(self.lines_content)} lines.')
+
+        new_content = [GetNormalizedLine(line) for line in new_lines]
+        delta = len(new_content) - (end - start)    # Number of added lines
+        self.lines_content[start:end] = new_content
+
+        # Restart from the last checkpoint before the edit
+        idx_start = bisect_right(self.checkpoints, start, key=attrgetter('line')) - 1
+        checkpoint = self.checkpoints[idx_start]
+        idx_first = self.FindElement(checkpoint.line)
+        self.ShiftElements(idx_first)   # The open elements of the checkpoint start before it
+        old_ends = {}
+        state = checkpoint.Restore(self.detector.blocks_key, self.detector.singles_key, old_ends)
+
+        # The previous checkpoints after the edit, where the processing can stop
+        idx_end = bisect_left(self.checkpoints, end, key=attrgetter('line'))
+        candidates = ((self.checkpoints[idx].line + delta, idx) for idx in range(idx_end, len(self.checkpoints)))
+        new_checkpoints, done, converged = self.Parse(state, checkpoint.line, candidates)
+
+        elements = self.stored
+
+        # The elements started before the checkpoint are already in the list (and were updated in place)
+        middle = [element for element in done if element[1] >= checkpoint.line]
+
+        if converged is None:   # Processed until the end of the file
+            middle.sort(key=itemgetter(1))
+            elements[idx_first:] = middle
+            self.shifted, self.shift = len(elements), 0
+            self.checkpoints[idx_start:] = new_checkpoints
+            return middle
+
+        old = self.checkpoints[converged]
+        idx_last = self.FindElement(old.line)
+        self.ShiftElements(idx_last)    # The elements open at the stop start before it
+
+        # The open elements get the end they had in the previous run
+        pairs = [((entry, old.line + end), element) for type_, entries in old.open_.items() for (entry, end), element in zip(entries, state.open_[type_])]
+        if old.single is not None:
+            pairs.append(((old.single[0], old.line + old.single[1]), state.single))
+
+        mapping = {}    # id of the previous element -> (new element, its end at the stop)
+        for (old_element, old_end), element in pairs:
+            if delta or element is not old_element or element[2] != old_end:
+                mapping[id(old_element)] = (element, element[2])
+            Finalize(old_element, old_end, element, delta, old_ends)
+            if element[1] >= checkpoint.line:
+                middle.append(element)
+
+        # The rest of the previous run is shifted lazily
+        middle.sort(key=itemgetter(1))
+        elements[idx_first:idx_last] = middle
+        self.shifted = idx_first + len(middle)
+        self.shift += delta
+
+        later = self.checkpoints[converged:]
+        old_line = old.line     # old is the first of them, so it is shifted too
+        for later_checkpoint in later:
+            if mapping:
+                if not later_checkpoint.Shift(old_line, delta, mapping):
+                    mapping = None  # The replaced elements are ended, they aren't in the next checkpoints
+            elif delta:
+                later_checkpoint.line += delta  # The ends of its open elements are relative to it
+            else:
+                break
+        self.checkpoints[idx_start:] = new_checkpoints + later
+
+        return middle
+
+    def Parse(self, state, begin, candidates):
+        """
+        Process the lines from begin, saving checkpoints, until the state is the same as at a candidate checkpoint.
+
+        Args:
+            state (ParseState): The parser state before the line begin, updated in place.
+            begin (int): The first line to process.
+            candidates (iterable of tuple): The (line, index) of the previous checkpoints where to stop, by line.
+
+        Returns:
+            tuple: The new checkpoints, the done elements and the index of the checkpoint where it stopped (None at the end of the file).
+        """
+        lines_content = self.lines_content
+        checkpoints, done = [], []
+        candidates = iter(candidates)
+        candidate = next(candidates, None)
+        depth_end, size = begin, self.checkpoint_every
+
+        for i in range(begin, len(lines_content)):
+            while candidate is not None and candidate[0] < i:
+                candidate = next(candidates, None)
+            if candidate is not None and candidate[0] == i and self.checkpoints[candidate[1]].IsSame(state):
+                return checkpoints, done, candidate[1]
+
+            if (i - begin) % self.checkpoint_every == 0:
+                checkpoints.append(Checkpoint(i, state))
+
+            # Get the blocks depth by chunks, growing as the processing goes on
+            if i == depth_end:
+                depth_end = min(i + size, len(lines_content))
+                depth = self.detector.GetDepth(lines_content[i:depth_end], first=i)
+                size = min(size*2, CHUNK_LINES)
+
+            self.detector.ProcessLine(state, depth, i, lines_content[i])
+            if state.done:
+                done.extend(state.done)
+                state.done = []
+
+        if begin == len(lines_content):     # Nothing to process, keep the state for the next edits
+            checkpoints.append(Checkpoint(begin, state))
+
+        done.extend(state.Close())
+        return checkpoints, done, None
+
+class Checkpoint:
+    """
+    Copy of the parser state before a line.
+
+    Args:
+        line (int): The line index.
+        state (ParseState): The parser state before this line.
+
+    Attributes:
+        line (int): The line index.
+        in_ (dict): A copy of the open/close counts of the blocks and of the singles state.
+        dead (dict): A copy of the number of removed end up entries of each block type.
+        open_ (dict): For each block type, the element of each entry and its end at this line, relative to the line.
+        single (tuple or None): The current single element and its end at this line, relative to the line.
+        block_parenthesis (tuple): The arguments state.
+        prev_block_type (str or None): The type of the last handled block.
+    """
+    def __init__(self, line, state):
+        self.line = line
+        self.in_ = {key:(list(value) if isinstance(value, list) else value) for key, value in state.in_.items()}
+        self.dead = dict(state.dead)
+        self.open_ = {key:[(element, element[2] - line) for element in open_] for key, open_ in state.open_.items()}
+        self.single = None if state.single is None else (state.single, state.single[2] - line)
+        self.block_parenthesis = tuple(state.block_parenthesis)
+        self.prev_block_type = state.prev_block_type
+
+    def IsSame(self, state):
+        """
+        Check if a parser state will process the next lines as this one.
+        The content of the elements don't change the processing, only the counts do.
+
+        Args:
+            state (ParseState): The parser state.
+
+        Returns:
+            bool: True if the counts, the arguments state and the previous block type are the same.
+        """
+        return (self.in_ == state.in_
+                and self.dead == state.dead
+                and self.block_parenthesis == tuple(state.block_parenthesis)
+                and (self.block_parenthesis[0] is True) == (state.block_parenthesis[0] is True)
+                and self.prev_block_type == state.prev_block_type
+                and (self.single is None) == (state.single is None))
+
+    def Restore(self, blocks_key, singles_key, old_ends):
+        """
+        Get a parser state equal to this one. The open elements get back their end at this line.
+
+        Args:
+            blocks_key (list of str): The block types.
+            singles_key (list of str): The single types.
+            old_ends (dict): Filled with the end of the open elements before they get back their end at this line, by id.
+
+        Returns:
+            ParseState: The parser state.
+        """
+        state = ParseState(blocks_key, singles_key)
+        state.in_ = {key:(list(value) if isinstance(value, list) else value) for key, value in self.in_.items()}
+        state.dead = dict(self.dead)
+        state.live = {key:[j for j, count in enumerate(state.in_[key]) if count > 0] for key in blocks_key}
+        for key, entries in self.open_.items():
+            for element, end in entries:
+                old_ends[id(element)] = element[2]
+                element[2] = self.line + end
+            state.open_[key] = [element for element, _ in entries]
+        if self.single is not None:
+            old_ends[id(self.single[0])] = self.single[0][2]
+            self.single[0][2] = self.line + self.single[1]
+            state.single = self.single[0]
+        state.block_parenthesis = list(self.block_parenthesis)
+        state.prev_block_type = self.prev_block_type
+        return state
+
+    def Shift(self, old_line, delta, mapping):
+        """
+        Update a checkpoint of the previous run that is kept after an edit, that has elements open where the processing stopped.
+
+        Args:
+            old_line (int): The line (in the previous run) where the new processing stopped.
+            delta (int): The number of added lines.
+            mapping (dict): For the elements open where the processing stopped, by id, the element replacing it and its end there.
+
+        Returns:
+            bool: True if the checkpoint has one of the elements of the mapping.
+        """
+        moved = False
+
+        def Move(element, end):
+            """
+            Get the element of the new run and its end at this checkpoint.
+            """
+            nonlocal moved
+            if id(element) in mapping:
+                moved = True
+                element, end_at_stop = mapping[id(element)]
+                return element, (end if self.line + end >= old_line else end_at_stop - self.line - delta)
+            return element, end
+
+        self.open_ = {key:[Move(element, end) for element, end in entries] for key, entries in self.open_.items()}
+        if self.single is not None:
+            self.single = Move(*self.single)
+        self.line += delta
+        return moved
+
+def Finalize(old_element, old_end, element, delta, old_ends):
+    """
+    Give to an element open where the processing stopped the end its counterpart got in the previous run.
+
+    Args:
+        old_element (list): The element of the previous run at the same place in the state.
+        old_end (int): Its end at the line where the processing stopped.
+        element (list): The element of the new run, updated in place.
+        delta (int): The number of added lines.
+        old_ends (dict): The end of the previous run of the elements reset by the restart, by id.
+    """
+    old_final = old_ends.get(id(old_element), old_element[2])
+    if old_final != old_end:    # Updated after the stop, so by the same lines
+        element[2] = old_final + delta
@@ -0,0 +1,131 @@
+import re
+from bisect import bisect_right
+import numpy as np
+
+SEGMENT_LENGTH = 500                                                # Length over which a line is split into statements
+SEGMENT_TOKENS = re.compile(r"'[^']*'|\"[^\"]*\"|/\*|\*/|[;{}]")   # The statements separators, out of the quoted strings removed by GetNormalizedLine
+
+def GetOffsetElements(text, detector, segment_length=SEGMENT_LENGTH):
+    """
+    Get the elements of a text by character offsets instead of lines, for minified code.
+
+    The text is split in lines, and the lines longer than segment_length (a minified bundle is a single line) are
+    split again into statements: after each ';', '{' and '*/', before each '/*', and around each '}'. The detector
+    processes these segments as lines, so the time only depends on the size of the text and not on its formatting.
+
+    Args:
+        text (str): The code.
+        detector (Detector): The compiled rules.
+        segment_length (int, optional): The length over which a line is split into statements. Defaults to SEGMENT_LENGTH.
+
+    Returns:
+        list of list: The identified elements (type, start offset, end offset, name), in start order. The end offset
+                      is the one after the last character of the element.
+    """
+    segments, starts, ends = GetSegments(text, segment_length)
+    return [[type_, starts[start], ends[end], name] for type_, start, end, name in detector.GetElements(segments)]
+
+def GetSegments(text, segment_length=SEGMENT_LENGTH):
+    """
+    Split a text in lines, and the long lines into statements.
+
+    Args:
+        text (str): The code.
+        segment_length (int, optional): The length over which a line is split into statements. Defaults to SEGMENT_LENGTH.
+
+    Returns:
+        tuple: The segments (list of str), the offset of the first character of each one and the offset after the last
+               one (list of int, the surrounding whitespace excluded).
+    """
+    segments, starts, ends = [], [], []
+
+    def Add(segment, offset):
+        """
+        Add a segment, with its offsets without the surrounding whitespace.
+        """
+        stripped = segment.lstrip()
+        start = offset + len(segment) - len(stripped)
+        segments.append(segment)
+        starts.append(start)
+        ends.append(start + len(stripped.rstrip()))
+
+    offset = 0
+    for line in text.split('\n'):
+        if len(line) <= segment_length:
+            Add(line, offset)
+        else:
+            begin = 0
+            for token in SEGMENT_TOKENS.finditer(line):
+                separator = token.group()
+                if separator in (';', '{', '*/'):
+                    cuts = (token.end(),)
+                elif separator == '/*':
+                    cuts = (token.start(),)
+                elif separator == '}':
+                    cuts = (token.start(), token.end())
+                else:   # Quoted string
+                    continue
+                for cut in cuts:
+                    if cut > begin:
+                        Add(line[begin:cut], offset + begin)
+                        begin = cut
+            if begin < len(line):
+                Add(line[begin:], offset + begin)
+        offset += len(line) + 1
+
+    return segments, starts, ends
+
+class LineIndex:
+    """
+    Mapping of the character offsets of a text to lines and columns.
+
+    Args:
+        text (str): The text.
+
+    Attributes:
+        line_starts (np.ndarray): The offset of the first character of each line.
+    """
+    def __init__(self, text):
+        self.line_starts = np.array([0] + [match.end() for match in re.finditer('\n', text)], dtype=np.int64)
+
+    def GetLineColumn(self, offset):
+        """
+        Get the line and the column of an offset.
+
+        Args:
+            offset (int): The character offset.
+
+        Returns:
+            tuple: The line and the column (from 0).
+        """
+        line = bisect_right(self.line_starts, offset) - 1
+        return line, offset - int(self.line_starts[line])
+
+    def GetLinesColumns(self, offsets):
+        """
+        Get the lines and the columns of many offsets at once.
+
+        Args:
+            offsets (array-like of int): The character offsets.
+
+        Returns:
+            tuple: The lines and the columns (np.ndarray, from 0).
+        """
+        offsets = np.asarray(offsets, dtype=np.int64)
+        lines = np.searchsorted(self.line_starts, offsets, side='right') - 1
+        return lines, offsets - self.line_starts[lines]
+
+    def Locate(self, elements):
+        """
+        Replace the offsets of elements by their (line, column).
+
+        Args:
+            elements (list of list): The elements (type, start offset, end offset, name) of GetOffsetElements.
+
+        Returns:
+            list of list: The elements (type, (line, column), (line, column), name).
+        """
+        starts = self.GetLinesColumns([element[1] for element in elements])
+        ends = self.GetLinesColumns([element[2] for element in elements])
+        return [[type_, (start_line, start_column), (end_line, end_column), name]
+                for (type_, _, _, name), start_line, start_column, end_line, end_column in zip(elements, *map(np.ndarray.tolist, starts + ends))]
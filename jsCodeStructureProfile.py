@@ -0,0 +1,262 @@
+"""
+Per-rule profiling of the detection, to find the rules and the steps that make a file slow.
+
+Usage: python jsCodeStructureProfile.py paths [paths ...] [--rules benchmarks.rules] [--top 20] [--encoding utf-8]
+"""
+import argparse
+import importlib
+import time
+
+from jsCodeStructureDetection import Detector
+from jsCodeStructureScan import GetPaths
+
+PHASES = ('DefineType', 'UpdateBlocks', 'IsEndUp')  # The timed steps of the processing
+
+class Stats:
+    """
+    Counters and timings of a ProfiledDetector, accumulated over all the files it processed.
+
+    Attributes:
+        files (int): The number of processed files.
+        lines (int): The number of processed lines.
+        kinds (dict): The kind of each rule ('block' or 'single'), by type.
+        attempts (dict): The number of times each rule was tried on a line, by type.
+        matches (dict): The number of times each rule matched a line (pattern found or single verified), by type.
+        selected (dict): The number of lines given to each type (a block match can be refused by is_not_in/is_inside).
+        rule_times (dict): The time spent in each rule pattern or verifier in seconds, by type.
+        phase_calls (dict): The number of calls of each step of PHASES.
+        phase_times (dict): The time spent in each step of PHASES in seconds (IsEndUp is included in UpdateBlocks).
+        peak_open (dict): The peak number of entries of the block state (the blocks still followed), by type.
+    """
+    def __init__(self):
+        self.files = 0
+        self.lines = 0
+        self.kinds = {}
+        self.attempts = {}
+        self.matches = {}
+        self.selected = {}
+        self.rule_times = {}
+        self.phase_calls = dict.fromkeys(PHASES, 0)
+        self.phase_times = dict.fromkeys(PHASES, 0.0)
+        self.peak_open = {}
+
+    def AddRule(self, type_, kind):
+        """
+        Start the counters of a rule, if it's not already done by another detector.
+
+        Args:
+            type_ (str): The rule type.
+            kind (str): 'block' or 'single'.
+        """
+        self.kinds.setdefault(type_, kind)
+        for counter in (self.attempts, self.matches, self.selected):
+            counter.setdefault(type_, 0)
+        self.rule_times.setdefault(type_, 0.0)
+
+    def Report(self, top=None):
+        """
+        Format the statistics, the most expensive rules first.
+
+        Args:
+            top (int, optional): The number of rules shown. Defaults to all.
+
+        Returns:
+            str: The report.
+        """
+        rules_time = sum(self.rule_times.values()) or 1
+        lines = [
+            f'Files: {self.files}  Lines: {self.lines}',
+            '',
+            f'{"Rule":<20} {"kind":<6} {"attempts":>10} {"matches":>10} {"selected":>10} {"time ms":>10} {"%":>6}',
+        ]
+        for type_ in sorted(self.rule_times, key=self.rule_times.get, reverse=True)[:top]:
+            lines.append(f'{type_:<20} {self.kinds[type_]:<6} {self.attempts[type_]:>10} {self.matches[type_]:>10} {self.selected[type_]:>10} '
+                         f'{self.rule_times[type_]*1000:>10.1f} {self.rule_times[type_]/rules_time*100:>6.1f}')
+
+        lines += ['', f'{"Step":<20} {"calls":>10} {"time ms":>10} {"us/call":>10}']
+        for phase in PHASES:
+            calls = self.phase_calls[phase]
+            lines.append(f'{phase:<20} {calls:>10} {self.phase_times[phase]*1000:>10.1f} {self.phase_times[phase]/(calls or 1)*1e6:>10.2f}')
+
+        lines += ['', f'{"Block":<20} {"peak open":>10}']
+        for type_, peak in sorted(self.peak_open.items(), key=lambda item: item[1], reverse=True):
+            lines.append(f'{type_:<20} {peak:>10}')
+        return '\n'.join(lines)
+
+class ProfiledDetector(Detector):
+    """
+    Detector recording in a Stats the work done by each rule and each step. The elements are the same as the ones of
+    a Detector, which doesn't pay anything for this: the instrumentation is only in this subclass.
+
+    Args:
+        blocks (dict): The block rules (cf GetElements).
+        singles (dict): The single-line rules (cf GetElements).
+        ignore (list of str, optional): The ignore strings (cf GetElements). Defaults to an empty list.
+        vectorized (bool, optional): The blocks depth engine (cf Detector). Defaults to True.
+        stats (Stats, optional): The statistics to fill, to share them between detectors. Defaults to a new one.
+
+    Attributes:
+        stats (Stats): The statistics of all the files processed by this detector.
+    """
+    def __init__(self, blocks, singles, ignore=[], vectorized=True, stats=None):
+        super().__init__(blocks, singles, ignore, vectorized)
+        self.stats = Stats() if stats is None else stats
+
+        for type_ in self.blocks_key:
+            self.stats.AddRule(type_, 'block')
+            self.stats.peak_open.setdefault(type_, 0)
+        for type_ in self.singles_key:
+            self.stats.AddRule(type_, 'single')
+
+        self.singles_up = [(type_, self.CountRule(type_, verify)) for type_, verify in self.singles_up]
+        self.singles_down = [(type_, self.CountRule(type_, verify)) for type_, verify in self.singles_down]
+        self.block_rules = [(type_, CountedPattern(self.CountRule(type_, regex.search)), keyword, is_not_in, is_inside) for type_, regex, keyword, is_not_in, is_inside in self.block_rules]
+
+    def CountRule(self, type_, function):
+        """
+        Wrap the pattern search or the verifier of a rule to count its attempts and matches and time it.
+
+        Args:
+            type_ (str): The rule type.
+            function (callable): The function called with the normalized line.
+
+        Returns:
+            callable: The wrapped function.
+        """
+        stats = self.stats
+
+        def Counted(line_content):
+            start = time.perf_counter()
+            result = function(line_content)
+            stats.rule_times[type_] += time.perf_counter() - start
+            stats.attempts[type_] += 1
+            if result:
+                stats.matches[type_] += 1
+            return result
+        return Counted
+
+    def TimePhase(self, phase, function):
+        """
+        Wrap a step to count its calls and time it.
+
+        Args:
+            phase (str): The step name, in PHASES.
+            function (callable): The step.
+
+        Returns:
+            callable: The wrapped step.
+        """
+        stats = self.stats
+
+        def Timed(*args, **kwargs):
+            start = time.perf_counter()
+            result = function(*args, **kwargs)
+            stats.phase_times[phase] += time.perf_counter() - start
+            stats.phase_calls[phase] += 1
+            return result
+        return Timed
+
+    def IterNormalizedElements(self, chunks):
+        """
+        Stream the elements of chunks of normalized lines, counting the file once it's processed (cf Detector.IterNormalizedElements).
+
+        Args:
+            chunks (iterable of list of str): The normalized lines, by chunks.
+
+        Yields:
+            list: The identified elements (type, start, end, name), in the order they end up.
+        """
+        yield from super().IterNormalizedElements(chunks)
+        self.stats.files += 1
+
+    def GetDepth(self, lines_content, first=0):
+        """
+        Get the blocks depth of normalized lines, with its IsEndUp timed (cf Detector.GetDepth).
+        """
+        depth = super().GetDepth(lines_content, first)
+        depth.IsEndUp = self.TimePhase('IsEndUp', depth.IsEndUp)
+        return depth
+
+    def ProcessLine(self, state, depth, i, line_content):
+        """
+        Process one line, then update the peak number of followed blocks (cf Detector.ProcessLine).
+        """
+        super().ProcessLine(state, depth, i, line_content)
+        self.stats.lines += 1
+        peak_open = self.stats.peak_open
+        for type_ in self.blocks_key:
+            if len(state.in_[type_]) > peak_open[type_]:
+                peak_open[type_] = len(state.in_[type_])
+
+    def DefineType(self, line_content, state):
+        """
+        Define the type of a line, timed and counted by type (cf Detector.DefineType).
+        """
+        start = time.perf_counter()
+        type_, match = super().DefineType(line_content, state)
+        self.stats.phase_times['DefineType'] += time.perf_counter() - start
+        self.stats.phase_calls['DefineType'] += 1
+        if type_ is not None:
+            self.stats.selected[type_] += 1
+        return type_, match
+
+    def UpdateBlocks(self, state, depth, i):
+        """
+        Update the blocks, timed (cf Detector.UpdateBlocks).
+        """
+        start = time.perf_counter()
+        super().UpdateBlocks(state, depth, i)
+        self.stats.phase_times['UpdateBlocks'] += time.perf_counter() - start
+        self.stats.phase_calls['UpdateBlocks'] += 1
+
+class CountedPattern:
+    """
+    Stand-in of a compiled pattern in the block rules, whose search is counted.
+
+    Args:
+        search (callable): The counted search function.
+    """
+    def __init__(self, search):
+        self.search = search
+
+def ProfileElements(lines, blocks, singles, ignore=[], stats=None):
+    """
+    Get the elements of lines (cf GetElements) and the statistics of their processing.
+
+    Args:
+        lines (iterable of str): The lines to be analyzed.
+        blocks (dict): The block rules (cf GetElements).
+        singles (dict): The single-line rules (cf GetElements).
+        ignore (list of str, optional): The ignore strings (cf GetElements). Defaults to an empty list.
+        stats (Stats, optional): The statistics to add to. Defaults to a new one.
+
+    Returns:
+        tuple: The elements (list of list) and the Stats.
+    """
+    detector = ProfiledDetector(blocks, singles, ignore, stats=stats)
+    return detector.GetElements(lines), detector.stats
+
+def Main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('paths', nargs='+', help='files, directories (their .js files) or glob patterns')
+    parser.add_argument('--rules', default='benchmarks.rules', help='module defining the blocks, singles (and ignore) rules')
+    parser.add_argument('--top', type=int, default=None, help='number of rules shown, the most expensive first')
+    parser.add_argument('--encoding', default='utf-8', help='encoding of the files')
+    args = parser.parse_args()
+
+    rules = importlib.import_module(args.rules)
+    detector = ProfiledDetector(rules.blocks, rules.singles, getattr(rules, 'ignore', []))
+
+    start = time.perf_counter()
+    for path in GetPaths(args.paths):
+        try:
+            with open(path, encoding=args.encoding) as file:
+                detector.GetElements(file)
+        except (OSError, UnicodeDecodeError) as e:
+            print(f'{path}: {e}')
+
+    print(detector.stats.Report(args.top))
+    print(f'\nTotal: {time.perf_counter() - start:.3f} s')
+
+if __name__ == '__main__':
+    Main()
@@ -0,0 +1,160 @@
+import glob
+import os
+import pickle
+from multiprocessing import Pool
+
+from jsCodeStructureDetection import Detector
+from jsCodeStructureCache import Cache
+
+BATCH_BYTES = 1 << 18   # Size of files sent together to a worker
+BATCH_FILES = 256       # Maximum number of files sent together to a worker
+
+worker_detector = None  # The detector (or cache) of a worker process, built once from the rules
+worker_encoding = None  # The encoding used by a worker process to read the files
+worker_compact = False  # If a worker process gives the elements as an Elements
+
+def ScanPaths(paths, blocks, singles, ignore=[], workers=None, ordered=False, encoding='utf-8', cache=None, compact=False, stats=None):
+    """
+    Get the elements of many files, spread over a pool of processes.
+
+    The rules are sent once to each worker, which compile them in a Detector. The small files are batched
+    together so the cost of sending work to a worker is spread over several files. An error on a file
+    (unreadable, bad encoding, ...) is given as the result of this file and don't stop the scan.
+
+    Args:
+        paths (str or list of str): Files, directories (all their .js files, recursively) or glob patterns.
+        blocks (dict): The block rules (cf GetElements).
+        singles (dict): The single-line rules (cf GetElements).
+        ignore (list of str, optional): The ignore strings (cf GetElements). Defaults to an empty list.
+        workers (int, optional): The number of processes, 1 to scan in the current process. Defaults to the number of CPUs.
+        ordered (bool, optional): Yield the files in the input order instead of the completion order. Defaults to False.
+        encoding (str, optional): The encoding of the files. Defaults to 'utf-8'.
+        cache (str, optional): A Cache directory shared by the workers, to skip the unchanged files. Defaults to None.
+        compact (bool, optional): Give the elements as an Elements, much smaller to send back from the workers. Defaults to False.
+        stats (dict, optional): Filled with the total 'hits' and 'misses' of the cache in the workers, as the files are yielded. Defaults to None.
+
+    Yields:
+        tuple: The path and its elements (list of list or Elements), or the Exception raised while processing it.
+    """
+    paths = GetPaths(paths)
+    workers = workers or os.cpu_count() or 1
+    stats = {} if stats is None else stats
+    stats.update(hits=0, misses=0)
+
+    # Scan in the current process
+    if workers == 1:
+        InitWorker(blocks, singles, ignore, encoding, cache, compact)
+        for path in paths:
+            batch, hits, misses = ScanBatch([path])
+            stats['hits'] += hits
+            stats['misses'] += misses
+            yield from batch
+        return
+
+    with Pool(workers, initializer=InitWorker, initargs=(blocks, singles, ignore, encoding, cache, compact)) as pool:
+        batches = GetBatches(paths)
+        results = pool.imap(ScanBatch, batches) if ordered else pool.imap_unordered(ScanBatch, batches)
+        for batch, hits, misses in results:
+            stats['hits'] += hits
+            stats['misses'] += misses
+            yield from batch
+
+def GetPaths(paths):
+    """
+    Expand the files, directories and glob patterns to the list of files, in order and without duplicates.
+
+    Args:
+        paths (str or list of str): Files, directories (all their .js files, recursively) or glob patterns.
+
+    Returns:
+        list of str: The files paths.
+    """
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+
+    files = {}
+    for path in paths:
+        path = os.fspath(path)
+        if os.path.isdir(path):
+            found = sorted(glob.glob(os.path.join(glob.escape(path), '**', '*.js'), recursive=True))
+        elif glob.has_magic(path):
+            found = sorted(glob.glob(path, recursive=True))
+        else:
+            found = [path]  # Kept even if it don't exist, the error is given as its result
+        files.update(dict.fromkeys(found))
+    return list(files)
+
+def GetBatches(paths):
+    """
+    Group the files in batches of about BATCH_BYTES (and at most BATCH_FILES files).
+
+    Args:
+        paths (list of str): The files paths.
+
+    Yields:
+        list of str: The files of each batch.
+    """
+    batch, size = [], 0
+    for path in paths:
+        try:
+            size += os.path.getsize(path)
+        except OSError:
+            pass    # The worker will report the error
+        batch.append(path)
+        if size >= BATCH_BYTES or len(batch) >= BATCH_FILES:
+            yield batch
+            batch, size = [], 0
+    if batch:
+        yield batch
+
+def InitWorker(blocks, singles, ignore, encoding, cache=None, compact=False):
+    """
+    Build the detector of a worker, once for all the files it will process.
+
+    Args:
+        blocks (dict): The block rules (cf GetElements).
+        singles (dict): The single-line rules (cf GetElements).
+        ignore (list of str): The ignore strings (cf GetElements).
+        encoding (str): The encoding of the files.
+        cache (str, optional): The Cache directory. Defaults to None.
+        compact (bool, optional): Give the elements as an Elements. Defaults to False.
+    """
+    global worker_detector, worker_encoding, worker_compact
+    worker_detector = Detector(blocks, singles, ignore) if cache is None else Cache(cache, blocks, singles, ignore)
+    worker_encoding = encoding
+    worker_compact = compact
+
+def ScanBatch(paths):
+    """
+    Get the elements of a batch of files in a worker.
+
+    Args:
+        paths (list of str): The files paths.
+
+    Returns:
+        tuple: The path and the elements (or the Exception raised while processing it) of each file (list of tuple),
+               then the number of cache hits and misses of the batch (0 without cache).
+    """
+    hits, misses = getattr(worker_detector, 'hits', 0), getattr(worker_detector, 'misses', 0)
+    batch = [ScanFile(path) for path in paths]
+    return batch, getattr(worker_detector, 'hits', 0) - hits, getattr(worker_detector, 'misses', 0) - misses
+
+def ScanFile(path):
+    """
+    Get the elements of a file with the worker detector.
+
+    Args:
+        path (str): The file path.
+
+    Returns:
+        tuple: The path and its elements, or the Exception raised while processing it.
+    """
+    try:
+        with open(path, encoding=worker_encoding) as file:
+            return path, worker_detector.GetElements(file, worker_compact)
+    except Exception as e:
+        try:
+            pickle.dumps(e)     # The error have to be sent back to the main process
+        except Exception:
+            e = Exception(f'{type(e).__name__}: {e}')
+        return path, e
@@ -0,0 +1,275 @@
+"""
+Analysis daemon: keeps the rule sets compiled and answers the requests of the clients on a local Unix socket.
+
+Usage: python jsCodeStructureServer.py [--rules benchmarks.rules ...] [--socket PATH] [--workers 1] [--batch-delay 0.001]
+"""
+import argparse
+import asyncio
+import importlib
+import io
+import json
+import multiprocessing
+import os
+import signal
+import socket
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from jsCodeStructureDetection import Detector
+from jsCodeStructureFile import GetElementsFromPath
+from jsCodeStructureClient import SOCKET_PATH, CheckDirectory
+
+BATCH_DELAY = 0.001     # Time waited after a request for the ones sent with it, in seconds
+BATCH_FILES = 256       # Maximum number of requests sent together to a worker
+REQUEST_BYTES = 1 << 26 # Maximum size of a request (a line of JSON)
+
+worker_detectors = None # The detectors of a worker by rules name, built once from the rules
+worker_default = None   # The name of the rules used when a request don't give one
+
+class Server:
+    """
+    Daemon answering the requests of the clients (cf RequestElements) on a local Unix socket.
+
+    Each client sends its requests as lines of JSON and gets a line of JSON for each of them, in the order they are
+    done. The requests that arrive together, from one or several clients, are gathered in a batch which is spread
+    over the workers, that compiled the rules once at their start.
+
+    Args:
+        rules (dict): The rule sets by name: (blocks, singles, ignore). The first one is the default.
+        socket_path (str, optional): The socket to listen on. Defaults to SOCKET_PATH.
+        workers (int, optional): The number of processes, 1 to process the requests in a thread of the daemon. Defaults to 1.
+        batch_delay (float, optional): Time waited after a request for the ones sent with it, in seconds. Defaults to BATCH_DELAY.
+
+    Attributes:
+        requests (int): The number of requests processed.
+        batches (int): The number of batches they were processed in.
+    """
+    def __init__(self, rules, socket_path=SOCKET_PATH, workers=1, batch_delay=BATCH_DELAY):
+        if not rules:
+            raise Exception('The daemon need at least one rule set.')
+        for name, (blocks, singles, ignore) in rules.items():
+            Detector(blocks, singles, ignore)   # Raise now if the rules are malformed
+        self.rules = rules
+        self.socket_path = socket_path
+        self.workers = workers
+        self.batch_delay = batch_delay
+        self.requests = 0
+        self.batches = 0
+
+    def Serve(self):
+        """
+        Run the daemon until a client asks it to stop (cf StopServer), or it gets SIGINT or SIGTERM.
+
+        Raises:
+            Exception: If another daemon already listens on the socket, or another user can change its directory (cf CheckDirectory).
+        """
+        asyncio.run(self.Run())
+
+    async def Run(self):
+        """
+        Listen on the socket and process the requests, until stopped (cf Serve).
+        """
+        # The directory of the socket is created only for the user, and can't be changed by the others
+        directory = os.path.dirname(os.path.abspath(self.socket_path))
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        CheckDirectory(directory)
+        self.RemoveStaleSocket()
+        self.queue = asyncio.Queue()
+        self.stopped = asyncio.Event()
+        self.running = set()    # The batches being processed, referenced until done
+
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, self.stopped.set)
+            except (NotImplementedError, RuntimeError):     # Not in the main thread
+                pass
+
+        # The processes are spawned, not forked from the daemon with its socket and its event loop
+        if self.workers == 1:
+            executor = ThreadPoolExecutor(1, initializer=InitWorker, initargs=(self.rules,))
+        else:
+            executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'), initializer=InitWorker, initargs=(self.rules,))
+        server = await asyncio.start_unix_server(self.HandleClient, path=self.socket_path, limit=REQUEST_BYTES)
+        os.chmod(self.socket_path, 0o600)   # Only the user can send requests
+        batcher = asyncio.create_task(self.Batch(executor))
+        try:
+            async with server:
+                await self.stopped.wait()
+        finally:
+            batcher.cancel()
+            executor.shutdown(cancel_futures=True)
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+    def RemoveStaleSocket(self):
+        """
+        Remove the socket left by a daemon that didn't stop properly.
+
+        Raises:
+            Exception: If a daemon still listens on it.
+        """
+        if not os.path.exists(self.socket_path):
+            return
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            try:
+                client.connect(self.socket_path)
+            except OSError:
+                os.unlink(self.socket_path)
+                return
+        raise Exception(f'A daemon already listens on {self.socket_path}.')
+
+    async def HandleClient(self, reader, writer):
+        """
+        Queue the requests of a client, and send back each response once done.
+
+        Args:
+            reader (asyncio.StreamReader): The requests of the client.
+            writer (asyncio.StreamWriter): Its responses.
+        """
+        loop = asyncio.get_running_loop()
+        responses = []
+        try:
+            async for line in reader:
+                try:
+                    request = json.loads(line)
+                except ValueError as e:
+                    request = {'error': f'The request is not valid JSON: {e}'}
+                if not isinstance(request, dict):
+                    request = {'error': f'The request is a JSON {type(request).__name__}, not an object.'}
+                if request.get('stop'):
+                    self.stopped.set()
+                    break
+                future = loop.create_future()
+                if 'error' in request:
+                    future.set_result({'error': request['error']})
+                else:
+                    self.queue.put_nowait((request, future))
+                responses.append(asyncio.create_task(self.Respond(request.get('id'), future, writer)))
+            await asyncio.gather(*responses)
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):  # The client left, or a request is too long
+            pass
+        finally:
+            writer.close()
+
+    async def Respond(self, id_, future, writer):
+        """
+        Send the response of a request once done.
+
+        Args:
+            id_ (any): The id of the request, given back with the response.
+            future (asyncio.Future): The response.
+            writer (asyncio.StreamWriter): The responses of the client.
+        """
+        response = await future
+        response['id'] = id_
+        try:
+            writer.write(json.dumps(response).encode() + b'\n')
+            await writer.drain()
+        except ConnectionError:     # The client left, the other responses are dropped too
+            pass
+
+    async def Batch(self, executor):
+        """
+        Gather the requests that arrive together and spread them over the workers.
+
+        Args:
+            executor (Executor): The workers.
+        """
+        while True:
+            batch = [await self.queue.get()]
+            await asyncio.sleep(self.batch_delay)   # Let the requests sent with this one arrive
+            while not self.queue.empty() and len(batch) < BATCH_FILES * self.workers:
+                batch.append(self.queue.get_nowait())
+            self.batches += 1
+            self.requests += len(batch)
+
+            size = -(-len(batch) // self.workers)   # A part by worker
+            for k in range(0, len(batch), size):
+                task = asyncio.create_task(self.RunBatch(executor, batch[k:k+size]))
+                self.running.add(task)
+                task.add_done_callback(self.running.discard)
+
+    async def RunBatch(self, executor, batch):
+        """
+        Process a part of a batch on a worker, and give each request its response.
+
+        Args:
+            executor (Executor): The workers.
+            batch (list of tuple): The requests and their futures.
+        """
+        try:
+            responses = await asyncio.get_running_loop().run_in_executor(executor, ProcessBatch, [request for request, _ in batch])
+        except Exception as e:  # The worker died
+            responses = [{'error': f'{type(e).__name__}: {e}'} for _ in batch]
+        for (_, future), response in zip(batch, responses):
+            if not future.done():
+                future.set_result(response)
+
+def InitWorker(rules):
+    """
+    Build the detectors of a worker, once for all the requests it will process.
+
+    Args:
+        rules (dict): The rule sets by name: (blocks, singles, ignore).
+    """
+    global worker_detectors, worker_default
+    worker_detectors = {name: Detector(blocks, singles, ignore) for name, (blocks, singles, ignore) in rules.items()}
+    worker_default = next(iter(rules))
+
+def ProcessBatch(requests):
+    """
+    Process a batch of requests in a worker.
+
+    Args:
+        requests (list of dict): The requests.
+
+    Returns:
+        list of dict: The response of each request.
+    """
+    return [ProcessRequest(request) for request in requests]
+
+def ProcessRequest(request):
+    """
+    Get the elements asked by a request with the worker detectors. An error is given as the response, and don't stop the daemon.
+
+    Args:
+        request (dict): The request (cf RequestElements).
+
+    Returns:
+        dict: The response: {'elements': list of list} or {'error': str}.
+    """
+    try:
+        name = request.get('rules') or worker_default
+        if name not in worker_detectors:
+            raise Exception(f'The rules {name} are not loaded by the daemon.')
+        detector = worker_detectors[name]
+
+        if 'path' in request:
+            elements = GetElementsFromPath(request['path'], detector, request.get('encoding'))
+        elif 'content' in request:
+            elements = detector.GetElements(io.StringIO(request['content'], newline=None))     # The lines as open() gives them
+        else:
+            raise Exception('The request need a path or a content.')
+        return {'elements': elements}
+    except Exception as e:
+        return {'error': f'{type(e).__name__}: {e}'}
+
+def Main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rules', nargs='+', default=['benchmarks.rules'], help='modules defining the blocks, singles (and ignore) rules, the requests refer to them by module name')
+    parser.add_argument('--socket', default=SOCKET_PATH, help='socket to listen on')
+    parser.add_argument('--workers', type=int, default=1, help='number of processes, 1 to process the requests in the daemon')
+    parser.add_argument('--batch-delay', type=float, default=BATCH_DELAY, help='time waited after a request for the ones sent with it, in seconds')
+    args = parser.parse_args()
+
+    rules = {}
+    for name in args.rules:
+        module = importlib.import_module(name)
+        rules[name] = (module.blocks, module.singles, getattr(module, 'ignore', []))
+
+    server = Server(rules, args.socket, args.workers, args.batch_delay)
+    print(f'Listening on {args.socket}', flush=True)
+    server.Serve()
+
+if __name__ == '__main__':
+    Main()
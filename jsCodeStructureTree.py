@@ -0,0 +1,143 @@
+from bisect import bisect_left
+
+class Node:
+    """
+    An element in the nesting tree.
+
+    Args:
+        type_ (str): The type of the element.
+        start (int): Its start line.
+        end (int): Its end line.
+        name (str or None): Its name.
+        parent (Node or None): The element containing it in the tree.
+
+    Attributes:
+        children (list of Node): The elements directly inside it, by start.
+        children_ends (list of int): The end of each child. As no child contains another, they are sorted too.
+    """
+    __slots__ = ('type', 'start', 'end', 'name', 'parent', 'children', 'children_ends')
+
+    def __init__(self, type_, start, end, name, parent):
+        self.type = type_
+        self.start = start
+        self.end = end
+        self.name = name
+        self.parent = parent
+        self.children = []
+        self.children_ends = []
+
+    def GetPath(self):
+        """
+        Get the elements containing this one, from the outermost, and this one (a breadcrumb).
+
+        Returns:
+            list of Node: The elements.
+        """
+        path = []
+        node = self
+        while node is not None:
+            path.append(node)
+            node = node.parent
+        return path[::-1]
+
+    def ToList(self):
+        """
+        Get the element as GetElements gives it.
+
+        Returns:
+            list: The element (type, start, end, name).
+        """
+        return [self.type, self.start, self.end, self.name]
+
+    def __repr__(self):
+        return f'Node({self.type!r}, {self.start}, {self.end}, {self.name!r}, {len(self.children)} children)'
+
+class Tree:
+    """
+    Nesting tree of elements, that is also an interval index over their lines.
+
+    The elements are read once in start order (the longest first for the same start), with the stack of the elements
+    that contain the current one: an element is a child of the last read element containing it. Two siblings can
+    overlap but never contain each other, so they are sorted by end as well as by start: the elements overlapping
+    lines are found with a binary search on each level they are in, as in a nested containment list.
+
+    Args:
+        elements (iterable of list): The elements (type, start, end, name), as GetElements gives them.
+
+    Attributes:
+        roots (list of Node): The elements contained in no other, by start.
+        roots_ends (list of int): The end of each root.
+        size (int): The number of elements.
+    """
+    def __init__(self, elements):
+        self.roots, self.roots_ends = [], []
+        self.size = 0
+
+        stack = []
+        for type_, start, end, name in sorted(elements, key=lambda element: (element[1], -element[2])):
+            # Remove the elements that don't contain this one, the next ones they contain are in this one too
+            while stack and stack[-1].end < end:
+                stack.pop()
+
+            parent = stack[-1] if stack else None
+            node = Node(type_, start, end, name, parent)
+            siblings, siblings_ends = (self.roots, self.roots_ends) if parent is None else (parent.children, parent.children_ends)
+            siblings.append(node)
+            siblings_ends.append(end)
+            stack.append(node)
+            self.size += 1
+
+    def GetOverlapping(self, first, last):
+        """
+        Get the elements that have at least one line in [first, last].
+
+        Args:
+            first (int): The first line.
+            last (int): The last line (included).
+
+        Returns:
+            list of Node: The elements, by start (so a containing element is before the ones it contains).
+        """
+        found = []
+        levels = [(self.roots, self.roots_ends, bisect_left(self.roots_ends, first))]
+        while levels:
+            nodes, ends, k = levels.pop()
+            if k < len(nodes) and nodes[k].start <= last:
+                node = nodes[k]
+                found.append(node)
+                levels.append((nodes, ends, k + 1))     # The next siblings, after the children of this one
+                if node.children:
+                    levels.append((node.children, node.children_ends, bisect_left(node.children_ends, first)))
+        return found
+
+    def GetEnclosing(self, line):
+        """
+        Get the elements containing a line.
+
+        Args:
+            line (int): The line.
+
+        Returns:
+            list of Node: The elements, from the outermost.
+        """
+        return self.GetOverlapping(line, line)
+
+    def __iter__(self):
+        """
+        Iterate over all the nodes, by start.
+        """
+        levels = [iter(self.roots)]
+        while levels:
+            node = next(levels[-1], None)
+            if node is None:
+                levels.pop()
+                continue
+            yield node
+            if node.children:
+                levels.append(iter(node.children))
+
+    def __len__(self):
+        return self.size
+
+    def __repr__(self):
+        return f'Tree({self.size} elements, {len(self.roots)} roots)'